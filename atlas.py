@@ -0,0 +1,141 @@
+import json
+import os
+
+import numpy as np
+import pygame
+
+from settings import ATLAS_PATH
+from sprites import asset_registry, to_display_format
+
+VERSION = 2
+
+
+def frame_name(filename, rect, flags=0):
+    x, y, width, height = rect
+    return f"{filename}:{x},{y},{width},{height}:{flags}"
+
+
+def _stamp(filename):
+    stat = os.stat(filename)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_game_assets():
+    # Passa por todos os carregadores do jogo; o que eles pedirem ao asset_registry
+    # é exatamente o que o atlas precisa conter
+    from entities.Item import Item
+    from entities.Npc.Droid import Droid
+    from entities.Npc.Spider import Spider
+    from entities.Player import Player
+    from world.Area import Area
+
+    Player._load_animations()
+    Spider._load_animations()
+    Droid._load_animation()
+    Area(0, 0).load_assets()
+    Item(0, 0, "health")
+    Item(0, 0, "ammo")
+    asset_registry.get_sheet("assets/space.png", alpha=False)
+
+
+def _display_format(surface):
+    # O atlas já é gravado em BGRA, o formato com alpha das telas de 32 bits: nesse caso
+    # a Surface sobre o memmap é usada como está, sem a cópia do convert_alpha
+    if pygame.display.get_surface() is None:
+        return surface
+    if surface.get_masks() == pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks():
+        return surface
+    return to_display_format(surface)
+
+
+class TextureAtlas:
+    # Todos os frames e sheets do jogo numa imagem só, em pixels BGRA crus: o arquivo é
+    # mapeado com np.memmap e embrulhado por pygame.image.frombuffer, sem decodificar PNG
+    # nem converter. Sheets e frames saem como subsurfaces do atlas.
+    def __init__(self, surface, index, pixels=None):
+        self.pixels = pixels
+        self.surface = _display_format(surface)
+        self.index = index
+        self.frames = index["frames"]
+        self.sheets = index["sheets"]
+
+    @classmethod
+    def load(cls, path=ATLAS_PATH):
+        # None se o atlas não foi montado ou algum PNG mudou depois: o jogo volta aos PNGs
+        try:
+            with open(path + ".json") as file:
+                index = json.load(file)
+            if index.get("version") != VERSION:
+                return None
+            if any(_stamp(filename) != stamp for filename, stamp in index["sources"].items()):
+                return None
+            # Cópia na escrita: a Surface aponta direto para as páginas do arquivo
+            pixels = np.memmap(path + ".rgba", dtype=np.uint8, mode="c")
+        except (OSError, ValueError, KeyError):
+            return None
+        width, height = index["size"]
+        if len(pixels) != width * height * 4:
+            return None
+        return cls(pygame.image.frombuffer(pixels, (width, height), "BGRA"), index, pixels)
+
+    def sheet(self, filename):
+        rect = self.sheets.get(filename)
+        return self.surface.subsurface(rect) if rect is not None else None
+
+    def frame(self, filename, rect, flags=0):
+        rect = self.frames.get(frame_name(filename, rect, flags))
+        return self.surface.subsurface(rect) if rect is not None else None
+
+
+def _pack(sizes, width):
+    # Prateleiras: imagens da mais alta para a mais baixa, da esquerda para a direita
+    positions = [None] * len(sizes)
+    x = y = shelf_height = 0
+    for i in sorted(range(len(sizes)), key=lambda i: -sizes[i][1]):
+        w, h = sizes[i]
+        if x + w > width:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        positions[i] = (x, y)
+        x += w
+        shelf_height = max(shelf_height, h)
+    return positions, y + shelf_height
+
+
+def build_atlas(path=ATLAS_PATH):
+    asset_registry.evict()
+    load_game_assets()
+    # Sheets de onde só saem frames não entram: o jogo nunca as pede inteiras
+    framed = {key[0] for key in asset_registry.frames}
+    images = {("sheet", filename): sheet for (filename, _), sheet in asset_registry.sheets.items() if filename not in framed}
+    images.update(
+        {("frame", frame_name(*key)): frame for key, frame in asset_registry.frames.items()}
+    )
+    keys = list(images)
+    sizes = [images[key].get_size() for key in keys]
+    width = max(1024, max(w for w, _ in sizes))
+    positions, height = _pack(sizes, width)
+
+    pixels = np.zeros((height, width, 4), dtype=np.uint8)
+    index = {"version": VERSION, "size": [width, height], "sources": {}, "sheets": {}, "frames": {}}
+    for key, (x, y), (w, h) in zip(keys, positions, sizes):
+        image = images[key]
+        # tobytes "RGBA" aplica o colorkey como alpha; depois R e B trocam de lugar
+        rgba = np.frombuffer(pygame.image.tobytes(image, "RGBA"), dtype=np.uint8).reshape(h, w, 4)
+        pixels[y:y + h, x:x + w] = rgba[:, :, (2, 1, 0, 3)]
+        kind, name = key
+        index["sheets" if kind == "sheet" else "frames"][name] = [x, y, w, h]
+    for filename in {key[0] for key in asset_registry.sheets}:
+        index["sources"][filename] = _stamp(filename)
+
+    pixels.tofile(path + ".rgba")
+    with open(path + ".json", "w") as file:
+        json.dump(index, file, indent=1)
+    return index
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    index = build_atlas()
+    width, height = index["size"]
+    print(f"{ATLAS_PATH}.rgba: {width}x{height}, {len(index['frames'])} frames, {len(index['sheets'])} sheets")
@@ -0,0 +1,83 @@
+import time
+
+import pygame
+
+from settings import BACKGROUND_DIRECT_MAX_BLITS, BACKGROUND_RESIZE_DELAY
+from sprites import to_display_format
+
+
+class BackgroundLayer:
+    # Tiles grandes (poucos blits para cobrir a tela) são desenhados direto. Tiles pequenos
+    # são repetidos uma vez numa camada do tamanho da tela mais um tile: por frame basta
+    # um blit com o deslocamento dentro do tile. A camada só é refeita quando a tela cresce,
+    # e depois de BACKGROUND_RESIZE_DELAY sem novos resizes (arrastar a borda da janela);
+    # até lá os tiles são desenhados direto.
+    def __init__(self, tile, parallax=1.0, delay=BACKGROUND_RESIZE_DELAY):
+        self.tile = tile
+        self.tile_width, self.tile_height = tile.get_size()
+        self.parallax = parallax
+        self.delay = delay
+        self.surface = None
+        self.width = self.height = 0
+        self.wanted = None
+        self.resized_at = 0.0
+        self.rebuilds = 0
+
+    def _tiles(self, screen_width, screen_height):
+        # Tiles por eixo para cobrir a tela com qualquer deslocamento
+        columns = -(-screen_width // self.tile_width) + 1
+        rows = -(-screen_height // self.tile_height) + 1
+        return columns, rows
+
+    def resize(self, screen_width, screen_height):
+        columns, rows = self._tiles(screen_width, screen_height)
+        if columns * rows <= BACKGROUND_DIRECT_MAX_BLITS:
+            self.surface = None
+            self.width = self.height = 0
+            self.wanted = None
+            return
+        width, height = columns * self.tile_width, rows * self.tile_height
+        if self.surface is not None and width <= self.width and height <= self.height:
+            self.wanted = None
+            return
+        self.wanted = (width, height)
+        self.resized_at = time.perf_counter()
+
+    def _rebuild(self):
+        width, height = self.wanted
+        self.wanted = None
+        self.width, self.height = width, height
+        surface = to_display_format(pygame.Surface((width, height)), alpha=False)
+        surface.blits(
+            [
+                (self.tile, (x, y))
+                for x in range(0, width, self.tile_width)
+                for y in range(0, height, self.tile_height)
+            ],
+            doreturn=False,
+        )
+        self.surface = surface
+        self.rebuilds += 1
+
+    def draw(self, screen, offset_x=0, offset_y=0):
+        if self.wanted is not None:
+            if time.perf_counter() - self.resized_at >= self.delay:
+                self._rebuild()
+        ox = int(offset_x * self.parallax) % self.tile_width
+        oy = int(offset_y * self.parallax) % self.tile_height
+        screen_width, screen_height = screen.get_size()
+        covered = self.width >= screen_width + self.tile_width and self.height >= screen_height + self.tile_height
+        if self.surface is not None and covered:
+            screen.blit(self.surface, (-ox, -oy))
+            return
+        # Só os tiles que cruzam a tela
+        columns = -(-(screen_width + ox) // self.tile_width)
+        rows = -(-(screen_height + oy) // self.tile_height)
+        screen.blits(
+            [
+                (self.tile, (x * self.tile_width - ox, y * self.tile_height - oy))
+                for x in range(columns)
+                for y in range(rows)
+            ],
+            doreturn=False,
+        )
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities.AnimationClock import AnimationClock
+
+FRAMES = 120
+COUNTS = (1_000, 10_000)
+DT = 1 / 60
+
+
+class LegacySprite:
+    # Caminho antigo do Spider._animate: get_ticks e last_update por entidade
+    def __init__(self, sequence):
+        self.sequence = sequence
+        self.animation_speed = 100
+        self.current_frame = 0
+        self.last_update = pygame.time.get_ticks()
+        self.image = sequence[0]
+        self.rect = self.image.get_rect()
+
+    def animate(self):
+        now = pygame.time.get_ticks()
+        if now - self.last_update > self.animation_speed:
+            self.last_update = now
+            self.current_frame = (self.current_frame + 1) % len(self.sequence)
+            center = self.rect.center
+            self.image = self.sequence[self.current_frame]
+            self.rect = self.image.get_rect(center=center)
+
+
+def bench(fn):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        fn()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+if __name__ == "__main__":
+    pygame.init()
+    tables = [[pygame.Surface((32, 32)) for _ in range(length)] for length in (5, 6, 6)]
+    clock = AnimationClock()
+    ids = [clock.register(frames, speed) for frames, speed in zip(tables, (100, 120, 150))]
+    for count in COUNTS:
+        legacy = [LegacySprite(tables[i % 3]) for i in range(count)]
+        animation_ids = np.array([ids[i % 3] for i in range(count)], dtype=np.int64)
+        phases = np.arange(count, dtype=np.int64) % 7
+
+        def old():
+            for sprite in legacy:
+                sprite.animate()
+            return [sprite.image for sprite in legacy]
+
+        def new():
+            clock.advance(DT)
+            return clock.frames_for(animation_ids, phases)
+
+        old_ms, new_ms = bench(old), bench(new)
+        print(f"{count:>6} sprites  por entidade {old_ms:7.3f} ms/frame | relógio global {new_ms:7.3f} ms/frame ({old_ms / new_ms:4.1f}x)")
@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from background import BackgroundLayer
+
+FRAMES = 200
+RESOLUTIONS = {"1080p": (1920, 1080), "4K": (3840, 2160)}
+TILES = {"space.png": None, "tile 64x64": (64, 64)}
+
+
+def tiled_loop(screen, tile, offset_x, offset_y):
+    # Caminho antigo do Game.draw_background. Ele deixava uma faixa do tamanho do
+    # deslocamento sem pintar à direita e embaixo; aqui os ranges vão até cobrir a tela,
+    # para os dois lados pintarem os mesmos pixels.
+    tile_width, tile_height = tile.get_size()
+    offset_x %= tile_width
+    offset_y %= tile_height
+    width, height = screen.get_size()
+    for x in range(0, width + offset_x, tile_width):
+        for y in range(0, height + offset_y, tile_height):
+            screen.blit(tile, (x - offset_x, y - offset_y))
+
+
+def bench(fn):
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        fn(frame * 3, frame * 2)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+if __name__ == "__main__":
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    space = pygame.image.load("assets/space.png").convert()
+    for tile_name, crop in TILES.items():
+        tile = space.subsurface((0, 0, *crop)).copy() if crop else space
+        for name, size in RESOLUTIONS.items():
+            screen = pygame.Surface(size).convert()
+            layer = BackgroundLayer(tile, delay=0)
+            layer.resize(*size)
+            start = time.perf_counter()
+            layer.draw(screen)
+            resize_ms = (time.perf_counter() - start) * 1000
+            mode = "camada" if layer.surface is not None else "direto"
+            old = bench(lambda x, y: tiled_loop(screen, tile, x, y))
+            new = bench(lambda x, y: layer.draw(screen, x, y))
+            print(
+                f"{tile_name:<11} {name:<6} loop {old:7.3f} ms/frame | {mode} {new:7.3f} ms/frame "
+                f"({old / new:4.1f}x) | primeiro frame {resize_ms:.1f} ms"
+            )
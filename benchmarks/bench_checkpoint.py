@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkpoint import Checkpointer, load_checkpoint
+from simulation import InputState, Simulation
+
+TICKS = 600
+
+
+def timed_save(checkpointer, simulation):
+    # Tempo na thread do jogo (snapshots) e tempo até o arquivo estar gravado
+    start = time.perf_counter()
+    checkpointer.save(simulation)
+    blocking = time.perf_counter() - start
+    checkpointer.wait()
+    return blocking * 1000, (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    pygame.init()
+    simulation = Simulation(seed=1)
+    for tick in range(TICKS):
+        simulation.player.health = simulation.player.max_health
+        simulation.step(1 / 60, InputState(InputState.RIGHT if tick < TICKS // 2 else InputState.DOWN))
+    with tempfile.TemporaryDirectory() as directory:
+        checkpointer = Checkpointer(directory)
+        for label in ("primeiro", "delta"):
+            before = checkpointer.stats()
+            blocking_ms, total_ms = timed_save(checkpointer, simulation)
+            after = checkpointer.stats()
+            print(
+                f"save {label:<8} jogo {blocking_ms:6.2f} ms | gravado em {total_ms:6.2f} ms | "
+                f"{after['areas_written'] - before['areas_written']} áreas, "
+                f"{after['bytes_written'] - before['bytes_written']} bytes"
+            )
+            simulation.step(1 / 60, InputState())
+        start = time.perf_counter()
+        restored = load_checkpoint(directory)
+        print(
+            f"load     {(time.perf_counter() - start) * 1000:6.2f} ms | "
+            f"{len(restored.world_grid.loaded_areas)} áreas carregadas, {len(restored.world_grid.saved_areas)} adiadas"
+        )
+        checkpointer.close()
+        restored.close()
+    simulation.close()
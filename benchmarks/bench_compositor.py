@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Game
+
+FRAMES = 120
+RESOLUTIONS = {"1024x768": (1024, 768), "1080p": (1920, 1080), "4K": (3840, 2160)}
+
+
+def draw_old(game):
+    # Caminho antigo do Game.draw_gameplay: Surface nova do tamanho da tela a cada frame
+    world = game.compositor.begin(game.screen)
+    game.world_grid.draw(world, game.viewport)
+    game.player.draw(world, game.viewport)
+    scaled = pygame.transform.scale(world, (game.screen_width, game.screen_height))
+    game.screen.blit(scaled, (0, 0))
+
+
+def draw_new(game):
+    world = game.compositor.begin(game.screen)
+    game.world_grid.draw(world, game.viewport)
+    game.player.draw(world, game.viewport)
+    game.compositor.present(game.screen)
+
+
+def bench(game, draw):
+    draw(game)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        draw(game)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+if __name__ == "__main__":
+    results = {}
+    for direct in (False, True):
+        game = Game(direct_render=direct)
+        game.reset_game(seed=1)
+        game.update(1 / 60)
+        for name, (width, height) in RESOLUTIONS.items():
+            game.handle_resize(pygame.event.Event(pygame.VIDEORESIZE, w=width, h=height))
+            if not direct:
+                results[name] = [bench(game, draw_old), bench(game, draw_new)]
+            else:
+                results[name].append(bench(game, draw_new))
+        game.simulation.close()
+    for name, (old, buffered, direct) in results.items():
+        print(
+            f"{name:<9} antigo {old:7.3f} ms/frame | buffer {buffered:7.3f} ms/frame ({old / buffered:4.1f}x)"
+            f" | direto {direct:7.3f} ms/frame ({old / direct:4.1f}x)"
+        )
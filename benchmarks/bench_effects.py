@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from camera import Viewport
+from effects import HIT, ParticlePool
+from settings import YELLOW
+
+FRAMES = 100
+PARTICLES = (1_000, 4_000, 16_000)
+VIEW = (1920, 1080)
+DT = 1 / 60
+
+
+def draw_old(effects, surface, viewport):
+    # Caminho antigo do Game.draw_ammo_effect: uma Surface nova e um círculo por efeito, por frame
+    for effect in effects:
+        effect["timer"] -= DT
+        if effect["timer"] <= 0:
+            effect["timer"] += 1.0
+        x, y = viewport.world_to_screen(*effect["pos"])
+        radius = 3
+        image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(image, (*YELLOW, int(255 * effect["timer"])), (radius, radius), radius)
+        surface.blit(image, (x - radius, y - radius))
+
+
+def bench(fn):
+    fn()
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        fn()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+if __name__ == "__main__":
+    pygame.init()
+    surface = pygame.Surface(VIEW)
+    viewport = Viewport(*VIEW)
+    rng = np.random.default_rng(1)
+    for count in PARTICLES:
+        positions = rng.random((count, 2)) * VIEW
+        effects = [{"pos": tuple(pos), "timer": rng.random()} for pos in positions.tolist()]
+        pool = ParticlePool(capacity=count)
+
+        def step_pool():
+            # Vida longa: o número de partículas vivas fica constante durante a medição
+            if pool.count < count:
+                for x, y in positions[pool.count:].tolist():
+                    pool.emit(HIT, x, y, speed=20, life=1e9)
+            pool.update(DT)
+            pool.draw(surface, viewport)
+
+        old = bench(lambda: draw_old(effects, surface, viewport))
+        new = bench(step_pool)
+        print(f"{count:>6} partículas  Surface por efeito {old:8.2f} ms/frame | pool {new:7.2f} ms/frame ({old / new:4.1f}x)")
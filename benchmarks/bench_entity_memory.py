@@ -0,0 +1,99 @@
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities.EntityPool import EntityPool
+from entities.Item import Item
+from entities.Npc.NPC import NPC
+from entities.Npc.Spider import Spider
+from settings import NPC_HEALTH, NPC_SPEED, NPC_DAMAGE
+from sprites import SpriteSheet, asset_registry
+from world.Area import Area
+
+COUNT = 5000
+CYCLES = 20
+
+
+class LegacySpider:
+    # Layout antigo: __dict__ por instância com spritesheet e tabelas de animação próprias
+    def __init__(self, x, y, area):
+        self.spritesheet = SpriteSheet("assets/SpiderSheet.png")
+        self.frame_width = self.frame_height = 32
+        self.animations = {"idle": [], "walking": []}
+        for i in range(6):
+            self.animations["idle"].append(self.spritesheet.get_image(i * 32, 0, 32, 32))
+            self.animations["walking"].append(self.spritesheet.get_image(i * 32, 32, 32, 32))
+        self.state = "walking"
+        self.animation_speed = 100
+        self.current_frame = 0
+        self.last_update = pygame.time.get_ticks()
+        self.area = area
+        self.engine = area.npc_engine
+        self.image = self.animations["walking"][0]
+        self.slot = self.engine.spawn(x, y, 32, 32, NPC_HEALTH * 0.8, NPC_SPEED * 1.2, NPC_DAMAGE * 0.7, (0, 0, 0, 0))
+
+
+class LegacyItem:
+    def __init__(self, x, y, item_type, variant=0):
+        self.item_type = item_type
+        self.variant = variant
+        self.image = asset_registry.get_sheet("assets/health.png")
+        self.rect = self.image.get_rect(topleft=(x, y))
+        self.collected = False
+        self.index_key = None
+
+
+def per_entity(factory):
+    # Memória alocada por entidade (o engine cresce antes para não entrar na conta)
+    entities = []
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(COUNT):
+        entities.append(factory(i))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return size / COUNT, entities
+
+
+def churn(pool, area):
+    # Load/unload repetido da mesma área: com pool as instâncias voltam a ser usadas
+    start = time.perf_counter()
+    for _ in range(CYCLES):
+        spiders = [pool.acquire(Spider, 100 + i % 300, 100 + i % 200, area) for i in range(COUNT // 10)]
+        for spider in spiders:
+            pool.release(spider)
+    return (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    area = Area(0, 0)
+    area.npc_engine._grow(COUNT * 4)
+    # Carrega as tabelas e os frames compartilhados antes de medir
+    Spider(0, 0, area).release()
+    LegacySpider(0, 0, area)
+    Item(0, 0, "health")
+    for name, factory in (
+        ("Spider antigo", lambda i: LegacySpider(i % 400, i % 300, area)),
+        ("Spider", lambda i: Spider(i % 400, i % 300, area)),
+        ("Item antigo", lambda i: LegacyItem(i, i, "health")),
+        ("Item", lambda i: Item(i, i, "health")),
+    ):
+        size, _ = per_entity(factory)
+        print(f"{name:<14} {size:8.1f} bytes/entidade")
+    print(f"NPC.__slots__ = {NPC.__slots__}")
+    pool = EntityPool()
+    no_pool = EntityPool(max_per_type=0)
+    print(f"load/unload x{CYCLES} sem pool {churn(no_pool, area):7.1f} ms | com pool {churn(pool, area):7.1f} ms | {pool.stats()}")
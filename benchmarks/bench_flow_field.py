@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import AREA_WIDTH, AREA_HEIGHT, FLOW_TILE_SIZE
+from world.FlowField import FlowField
+
+REPEATS = 50
+AGENTS = (100, 1_000, 10_000)
+WINDOWS = {"1 área": (1, 1), "4 áreas": (2, 2), "9 áreas": (3, 3)}
+
+
+def walls(shape, density, rng):
+    # Paredes soltas mais corredores horizontais com uma passagem cada
+    walkable = rng.random(shape) >= density
+    for row in range(8, shape[0], 12):
+        walkable[row] = False
+        walkable[row, rng.integers(shape[1])] = True
+    return walkable
+
+
+def bench(fn):
+    fn()
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(1)
+    field = FlowField()
+    for name, (areas_x, areas_y) in WINDOWS.items():
+        shape = (-(-areas_y * AREA_HEIGHT // FLOW_TILE_SIZE), -(-areas_x * AREA_WIDTH // FLOW_TILE_SIZE))
+        for label, walkable in (("aberto", np.ones(shape, dtype=np.bool_)), ("paredes", walls(shape, 0.15, rng))):
+            # Jogador no canto: o BFS precisa atravessar a janela inteira
+            rebuild_ms = bench(lambda: field.rebuild(walkable, (0, 0), (1, 1)))
+            print(f"{name:<8} {shape[1]:>3}x{shape[0]:<3} tiles {label:<8} rebuild {rebuild_ms:7.3f} ms")
+    for count in AGENTS:
+        centers = rng.random((count, 2)) * (AREA_WIDTH * 2, AREA_HEIGHT * 2)
+        lookup_ms = bench(lambda: field.sample(centers))
+        print(f"{count:>6} NPCs consulta {lookup_ms:7.3f} ms ({lookup_ms * 1e6 / count:6.1f} ns/NPC)")
@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import AREA_WIDTH, AREA_HEIGHT
+from world.Area import MARK_SIZES, TILE_ROWS, TILE_COLS, generate_area
+from world.GenerationCache import GenerationCache
+
+SEED = 1
+AREAS = 400
+GRID_SIZES = (20, 200)
+
+
+def legacy_generate(seed, grid_x, grid_y):
+    # Geração antiga: random.Random por área e uma chamada Python por tile/entidade
+    rng = random.Random(f"{seed}:{grid_x}:{grid_y}")
+    world_x, world_y = grid_x * AREA_WIDTH, grid_y * AREA_HEIGHT
+    tiles = np.array([rng.randrange(9) for _ in range(TILE_ROWS * TILE_COLS)], dtype=np.uint8)
+    decorations = []
+    for _ in range(rng.randint(10, 25)):
+        mark = rng.randrange(len(MARK_SIZES))
+        size = int(MARK_SIZES[mark])
+        decorations.append((mark, world_x + rng.randint(0, AREA_WIDTH - size), world_y + rng.randint(0, AREA_HEIGHT - size)))
+    npcs = [
+        (0 if rng.random() < 0.7 else 1, world_x + rng.randint(50, AREA_WIDTH - 50), world_y + rng.randint(50, AREA_HEIGHT - 50))
+        for _ in range(rng.randint(5, 15))
+    ]
+    items = [
+        (0, world_x + rng.randint(25, AREA_WIDTH - 25), world_y + rng.randint(25, AREA_HEIGHT - 25), 0)
+        for _ in range(rng.randint(2, 5))
+    ]
+    return tiles.reshape(TILE_ROWS, TILE_COLS), decorations, npcs, items
+
+
+def per_area(fn, coords):
+    start = time.perf_counter()
+    for coord in coords:
+        fn(coord)
+    return (time.perf_counter() - start) / len(coords) * 1000
+
+
+if __name__ == "__main__":
+    coords = [(i % 20, i // 20) for i in range(AREAS)]
+    legacy_ms = per_area(lambda c: legacy_generate(SEED, *c), coords)
+    numpy_ms = per_area(lambda c: generate_area(SEED, *c), coords)
+    print(f"geração     random {legacy_ms:7.3f} ms/área | numpy {numpy_ms:7.3f} ms/área ({legacy_ms / numpy_ms:4.1f}x)")
+    with tempfile.TemporaryDirectory() as directory:
+        for grid_size in GRID_SIZES:
+            path = os.path.join(directory, f"world_{grid_size}.bin")
+            cache = GenerationCache(path, SEED, grid_size)
+            put_ms = per_area(lambda c: cache.put(c, generate_area(SEED, *c)), coords)
+            cache.close()
+            # Reabrir não lê o arquivo: só as áreas consultadas tocam o disco
+            start = time.perf_counter()
+            cache = GenerationCache(path, SEED, grid_size)
+            open_ms = (time.perf_counter() - start) * 1000
+            get_ms = per_area(cache.get, coords)
+            used = os.stat(path).st_blocks * 512
+            cache.close()
+            print(
+                f"GRID_SIZE {grid_size:<4} abrir {open_ms:6.3f} ms | gerar+gravar {put_ms:6.3f} ms/área "
+                f"| ler do cache {get_ms:6.3f} ms/área | arquivo {os.path.getsize(path) / 1e6:6.1f} MB "
+                f"({used / 1e6:.1f} MB em disco)"
+            )
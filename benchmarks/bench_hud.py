@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hud import Hud, Minimap
+from settings import BLACK, WHITE, GREEN, YELLOW, GRAY, MINIMAP_CELL_STRIDE, MINIMAP_MAX_SIZE
+
+FRAMES = 600
+DT = 1 / 60
+GRID_SIZES = (3, 32, 200)
+
+
+def old_ui(screen, font, remaining_time, health, ammo):
+    # Caminho antigo do Game.draw_ui
+    texts = [f"Tempo: {remaining_time:.1f}s", f"Vida: {health}/100", f"Munição: {ammo}"]
+    for i, text in enumerate(texts):
+        screen.blit(font.render(text, True, WHITE), (10, 10 + i * 30))
+
+
+def old_minimap(screen, grid_size, player_coord, active_areas):
+    # Caminho antigo do Game.draw_minimap, com o mesmo layout do Minimap
+    stride = max(1, min(MINIMAP_CELL_STRIDE, MINIMAP_MAX_SIZE // grid_size))
+    padding = stride // 6
+    cell_size = stride - padding
+    total = grid_size * stride - padding
+    map_x, map_y = screen.get_width() - total - 10, 10
+    background_rect = pygame.Rect(map_x - 2, map_y - 2, total + 4, total + 4)
+    pygame.draw.rect(screen, BLACK, background_rect)
+    pygame.draw.rect(screen, WHITE, background_rect, 1)
+    for gx in range(grid_size):
+        for gy in range(grid_size):
+            coord, color = (gx, gy), GRAY
+            if coord == player_coord:
+                color = YELLOW
+            elif coord in active_areas:
+                color = GREEN
+            pygame.draw.rect(screen, color, (map_x + gx * stride, map_y + gy * stride, cell_size, cell_size))
+
+
+def frames(grid_size):
+    # Jogador andando na diagonal: troca de área de vez em quando, vida e munição quase fixas
+    for frame in range(FRAMES):
+        cell = min(grid_size - 1, frame // 120)
+        player = (cell, cell)
+        active = {(x, y) for x in range(cell - 1, cell + 2) for y in range(cell - 1, cell + 2)}
+        yield 300 - frame * DT, 100 - frame // 200 * 10, frame // 300, player, active
+
+
+def bench(fn, grid_size):
+    start = time.perf_counter()
+    for args in frames(grid_size):
+        fn(*args)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+if __name__ == "__main__":
+    pygame.init()
+    screen = pygame.display.set_mode((1024, 768))
+    font = pygame.font.Font(None, 36)
+    for grid_size in GRID_SIZES:
+        hud, minimap = Hud(font), Minimap(grid_size)
+
+        def old(remaining_time, health, ammo, player, active):
+            old_ui(screen, font, remaining_time, health, ammo)
+            old_minimap(screen, grid_size, player, active)
+
+        def new(remaining_time, health, ammo, player, active):
+            hud.draw(screen, remaining_time, health, 100, ammo)
+            minimap.update(player, active)
+            minimap.draw(screen)
+
+        old_ms, new_ms = bench(old, grid_size), bench(new, grid_size)
+        print(
+            f"GRID_SIZE {grid_size:<4} antigo {old_ms:7.3f} ms/frame | cache {new_ms:7.3f} ms/frame "
+            f"({old_ms / new_ms:5.1f}x) | renders {hud.text.renders}/{FRAMES * 3} | repaints {minimap.repaints}"
+        )
@@ -0,0 +1,58 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import world.WorldGrid as world_grid_module
+from simulation import InputState, Simulation
+
+MOVES = (InputState.RIGHT, InputState.DOWN, InputState.LEFT, InputState.UP)
+
+
+def run(seed, ticks, dt, lod):
+    if not lod:
+        # Sem níveis: tudo que está carregado anda todo tick, sem orçamento
+        world_grid_module.LOD_NEAR_INTERVAL = 0.0
+        world_grid_module.LOD_FAR_INTERVAL = 0.0
+        world_grid_module.LOD_NPC_BUDGET = 10**9
+    simulation = Simulation(seed)
+    if not lod:
+        simulation.set_view(10**9, 10**9)
+    engine = simulation.world_grid.npc_engine
+    updates = [0]
+    move, drift = engine.move, engine.drift
+
+    def counted_move(slots, *args):
+        updates[0] += len(slots)
+        return move(slots, *args)
+
+    def counted_drift(slots, *args):
+        updates[0] += len(slots)
+        return drift(slots, *args)
+
+    engine.move, engine.drift = counted_move, counted_drift
+    loaded = 0
+    start = time.perf_counter()
+    for tick in range(ticks):
+        simulation.step(dt, InputState(MOVES[tick // 240 % 4]))
+        simulation.player.health = simulation.player.max_health
+        loaded = max(loaded, len(simulation.world_grid.loaded_areas))
+    elapsed = time.perf_counter() - start
+    simulation.close()
+    return elapsed, updates[0] / ticks, loaded, [len(tier) for tier in simulation.world_grid.lod_tiers]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Custo da simulação com e sem níveis de detalhe")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ticks", type=int, default=3000)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    args = parser.parse_args()
+    for lod in (True, False):
+        elapsed, per_tick, loaded, tiers = run(args.seed, args.ticks, args.dt, lod)
+        print(
+            f"{'com LOD' if lod else 'sem LOD':<8} {elapsed / args.ticks * 1000:6.3f} ms/tick | "
+            f"{per_tick:6.1f} NPCs atualizados/tick | até {loaded} áreas carregadas | níveis finais {tiers}"
+        )
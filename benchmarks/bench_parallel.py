@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities.Npc.NPCEngine import NPCEngine
+from entities.Npc.ParallelMover import ParallelMover
+from settings import AREA_WIDTH, AREA_HEIGHT, NPC_SPEED
+
+AREAS = 16
+
+
+class Target:
+    # Só o que NPCEngine.move lê do jogador
+    def __init__(self, x, y):
+        self.rect = (x, y)
+
+    def get_rect(self):
+        return self
+
+    @property
+    def center(self):
+        return self.rect
+
+
+def populate(engine, count, seed):
+    rng = np.random.default_rng(seed)
+    per_area = count // AREAS
+    for area in range(AREAS):
+        ax, ay = area % 4 * AREA_WIDTH, area // 4 * AREA_HEIGHT
+        bounds = (ax, ay, ax + AREA_WIDTH, ay + AREA_HEIGHT)
+        for x, y in rng.random((per_area, 2)) * (AREA_WIDTH - 32, AREA_HEIGHT - 32):
+            engine.spawn(ax + x, ay + y, 24, 24, 50, NPC_SPEED, 10, bounds)
+    slots = np.arange(engine.count)
+    engine.set_active(slots, True)
+    return slots
+
+
+def run(workers, count, ticks, seed):
+    parallel = ParallelMover(workers) if workers else None
+    engine = NPCEngine(capacity=count, parallel=parallel)
+    slots = populate(engine, count, seed)
+    target = Target(2 * AREA_WIDTH, 2 * AREA_HEIGHT)
+    engine.move(slots, 1 / 60, target)
+    start = time.perf_counter()
+    for tick in range(ticks):
+        target.rect = (2 * AREA_WIDTH + tick % 200, 2 * AREA_HEIGHT)
+        engine.move(slots, 1 / 60, target)
+    elapsed = time.perf_counter() - start
+    result = engine.pos[: engine.count].copy(), engine.cooldown[: engine.count].copy()
+    if parallel is not None:
+        parallel.shutdown()
+    return elapsed / ticks * 1000, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Movimento dos NPCs em 1..N processos")
+    parser.add_argument("--npcs", type=int, default=200_000)
+    parser.add_argument("--ticks", type=int, default=100)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    serial_ms, expected = run(0, args.npcs, args.ticks, args.seed)
+    print(f"serial      {serial_ms:8.3f} ms/tick")
+    workers = 1
+    while workers <= max(1, args.max_workers):
+        parallel_ms, result = run(workers, args.npcs, args.ticks, args.seed)
+        same = all(np.array_equal(a, b) for a, b in zip(expected, result))
+        print(
+            f"{workers:>2} processos {parallel_ms:8.3f} ms/tick ({serial_ms / parallel_ms:4.2f}x) "
+            f"| idêntico ao serial: {'sim' if same else 'NÃO'}"
+        )
+        workers *= 2
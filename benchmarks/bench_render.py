@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from camera import Viewport
+from settings import AREA_WIDTH, AREA_HEIGHT, GREEN, RED
+from simulation import Simulation
+
+FRAMES = 200
+EXTRA_NPCS = (0, 200, 1000)
+VIEWS = {"1024x768": (1024, 768), "4K": (3840, 2160)}
+
+
+def draw_old(world_grid, surface, viewport):
+    # Caminho antigo do Area.draw: um blit e um is_visible por chunk, item e NPC, e
+    # dois pygame.draw.rect por barra de vida
+    zoom = viewport.zoom
+    for area in world_grid.visible_areas(viewport):
+        for chunk, chunk_rect in area.ground_chunks:
+            if viewport.is_visible(chunk_rect.x, chunk_rect.y, chunk_rect.width, chunk_rect.height):
+                surface.blit(viewport.scale(chunk), viewport.world_to_screen(chunk_rect.x, chunk_rect.y))
+        for item in area.items:
+            if not item.collected and viewport.is_visible(*item.rect):
+                surface.blit(viewport.scale(item.image), viewport.world_to_screen(item.rect.x, item.rect.y))
+        for npc in area.npcs:
+            rect = npc.rect
+            if not npc.is_alive or not viewport.is_visible(*rect):
+                continue
+            sx, sy = viewport.world_to_screen(rect.x, rect.y)
+            surface.blit(viewport.scale(npc.image), (sx, sy))
+            if npc.health < npc.max_health:
+                pct = npc.health / npc.max_health
+                pygame.draw.rect(surface, RED, (sx, sy - 7 * zoom, rect.width * zoom, 4 * zoom))
+                pygame.draw.rect(surface, GREEN, (sx, sy - 7 * zoom, rect.width * pct * zoom, 4 * zoom))
+
+
+def bench(fn):
+    fn()
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        fn()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+if __name__ == "__main__":
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    simulation = Simulation(seed=1)
+    world_grid = simulation.world_grid
+    world_grid.update_active_areas(AREA_WIDTH * 1.5, AREA_HEIGHT * 1.5)
+    center = world_grid.areas[(1, 1)]
+    spawned = 0
+    for extra in EXTRA_NPCS:
+        # NPCs extras na área central, metade com vida parcial para desenhar barras
+        while spawned < extra:
+            x = center.world_x + spawned * 7 % AREA_WIDTH
+            y = center.world_y + spawned * 13 % AREA_HEIGHT
+            npc = type(center.npcs[0])(x, y, center)
+            if spawned % 2:
+                npc.take_damage(1)
+            center.npcs.append(npc)
+            spawned += 1
+        center.slots = np.array([npc.slot for npc in center.npcs], dtype=np.intp)
+        world_grid.npc_engine.set_active(center.slots, True)
+        for name, (width, height) in VIEWS.items():
+            surface = pygame.Surface((width, height))
+            viewport = Viewport(width, height)
+            viewport.update(AREA_WIDTH * 1.5, AREA_HEIGHT * 1.5)
+            old = bench(lambda: draw_old(world_grid, surface, viewport))
+            new = bench(lambda: world_grid.draw(surface, viewport))
+            print(
+                f"+{extra:<5} NPCs {name:<9} por entidade {old:7.3f} ms/frame | "
+                f"RenderQueue {new:7.3f} ms/frame ({old / new:4.1f}x)"
+            )
@@ -0,0 +1,66 @@
+import math
+import os
+import sys
+import time
+
+import numpy as np
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import AMMO_RADIUS, NPC_SIZE, SPATIAL_CELL_SIZE
+from world.SpatialHash import SpatialHash
+
+WORLD_SIZE = 2400
+QUERIES = 200
+
+
+def bench(label, fn, repeat=QUERIES):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<34} {elapsed * 1e6:10.1f} us")
+    return elapsed
+
+
+def run(count, rng):
+    positions = rng.uniform(0, WORLD_SIZE - NPC_SIZE, (count, 2))
+    sizes = np.full((count, 2), float(NPC_SIZE))
+    rects = [pygame.Rect(int(x), int(y), NPC_SIZE, NPC_SIZE) for x, y in positions]
+    player = pygame.Rect(WORLD_SIZE // 2, WORLD_SIZE // 2, 32, 32)
+
+    index = SpatialHash(SPATIAL_CELL_SIZE, count)
+    for key, (x, y) in enumerate(positions):
+        index.insert(key, x, y, NPC_SIZE, NPC_SIZE)
+
+    print(f"{count} entidades")
+
+    # Caminho atual: Player.use_ammo_item e Game.check_collisions varrem tudo
+    def linear_radius():
+        return [
+            r for r in rects
+            if math.hypot(player.centerx - r.centerx, player.centery - r.centery) <= AMMO_RADIUS
+        ]
+
+    def linear_rect():
+        return [r for r in rects if player.colliderect(r)]
+
+    linear_r = bench("linear raio (hypot)", linear_radius)
+    hashed_r = bench("hash raio", lambda: index.query_radius(*player.center, AMMO_RADIUS))
+    linear_c = bench("linear AABB (colliderect)", linear_rect)
+    hashed_c = bench("hash AABB", lambda: index.query_rect(*player))
+
+    def move():
+        positions[:] += rng.normal(0, 1.0, positions.shape)
+        index.update(np.arange(count), positions, sizes)
+
+    bench("hash update (todos se movem)", move, repeat=20)
+    bench("hash pares (raio NPC_SIZE)", lambda: index.query_pairs(NPC_SIZE), repeat=5)
+    print(f"  speedup raio {linear_r / hashed_r:6.1f}x, AABB {linear_c / hashed_c:6.1f}x")
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    for count in (100, 1_000, 10_000):
+        run(count, rng)
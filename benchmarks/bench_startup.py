@@ -0,0 +1,46 @@
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+RUNS = 7
+# Cada medição é um processo novo: nada decodificado nem em cache no asset_registry
+# (o cache de páginas do sistema operacional continua quente)
+PROBE = """
+import os, sys, time
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+import pygame
+pygame.init()
+pygame.display.set_mode((320, 240))
+from atlas import TextureAtlas, load_game_assets
+from sprites import asset_registry
+import entities.Item, entities.Npc.Droid, entities.Npc.Spider, entities.Player, world.Area
+start = time.perf_counter()
+if sys.argv[1] == "atlas":
+    atlas = TextureAtlas.load()
+    if atlas is None:
+        sys.exit("atlas ausente ou desatualizado")
+    asset_registry.use_atlas(atlas)
+load_game_assets()
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def cold_start(mode):
+    times = []
+    for _ in range(RUNS):
+        result = subprocess.run([sys.executable, "-c", PROBE, mode], capture_output=True, text=True, check=True)
+        times.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    # Monta (ou atualiza) o atlas antes de medir
+    subprocess.run([sys.executable, "atlas.py"], check=True, capture_output=True)
+    png_ms = cold_start("png")
+    atlas_ms = cold_start("atlas")
+    print(f"carregar assets do jogo: PNGs {png_ms:7.2f} ms | atlas {atlas_ms:7.2f} ms ({png_ms / atlas_ms:4.1f}x)")
@@ -1,9 +1,19 @@
+import weakref
+
+import numpy as np
+import pygame
+
+
 class Viewport:
-    def __init__(self, screen_width, screen_height):
+    # x, y, width e height ficam sempre em unidades do mundo. Com zoom != 1 o
+    # desenho vai direto para a tela: posições e sprites são escalados aqui.
+    def __init__(self, screen_width, screen_height, zoom=1):
         self.x = 0
         self.y = 0
         self.width = screen_width
         self.height = screen_height
+        self.zoom = zoom
+        self.scaled_images = weakref.WeakKeyDictionary()
 
     def update(self, target_x, target_y):
         self.x = target_x - self.width // 2
@@ -13,8 +23,33 @@ class Viewport:
         self.width = new_width
         self.height = new_height
 
+    def set_zoom(self, zoom):
+        if zoom != self.zoom:
+            self.zoom = zoom
+            self.scaled_images = weakref.WeakKeyDictionary()
+
     def world_to_screen(self, world_x, world_y):
-        return world_x - self.x, world_y - self.y
+        if self.zoom == 1:
+            return world_x - self.x, world_y - self.y
+        return round((world_x - self.x) * self.zoom), round((world_y - self.y) * self.zoom)
+
+    def to_screen(self, positions):
+        # world_to_screen em lote para um array (n, 2) de posições inteiras
+        screen = positions - (self.x, self.y)
+        if self.zoom != 1:
+            screen = np.round(screen * self.zoom).astype(np.int64)
+        return screen
+
+    def scale(self, image):
+        # Versão do sprite já escalada para o zoom atual, gerada uma vez por Surface
+        if self.zoom == 1:
+            return image
+        scaled = self.scaled_images.get(image)
+        if scaled is None:
+            width, height = image.get_size()
+            scaled = pygame.transform.scale(image, (round(width * self.zoom), round(height * self.zoom)))
+            self.scaled_images[image] = scaled
+        return scaled
 
     def is_visible(self, x, y, width=0, height=0):
         return (
@@ -24,3 +59,11 @@ class Viewport:
             and y < self.y + self.height
         )
 
+    def visible_mask(self, positions, sizes):
+        return (
+            (positions[:, 0] + sizes[:, 0] > self.x)
+            & (positions[:, 0] < self.x + self.width)
+            & (positions[:, 1] + sizes[:, 1] > self.y)
+            & (positions[:, 1] < self.y + self.height)
+        )
+
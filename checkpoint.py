@@ -0,0 +1,196 @@
+import json
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from settings import CHECKPOINT_DIR, SIM_WORKERS
+from simulation import Simulation
+
+# Cabeçalho do mundo: seed, relógio da simulação, jogador, coordenadas com estado salvo
+# e o estado do gerador do LOD. Cada área salva fica num arquivo próprio, em colunas.
+VERSION = 1
+WORLD_MAGIC = b"RLCK"
+AREA_MAGIC = b"RLCA"
+WORLD_HEADER = struct.Struct("<4sHQQdBdddIIII")
+AREA_HEADER = struct.Struct("<4sHiiII")
+STATES = ("playing", "game_over", "win_screen")
+# (nome, dtype, largura) das colunas de NPCs e de itens, na ordem do arquivo
+NPC_COLUMNS = (("kind", "u1", 1), ("pos", "<f8", 2), ("health", "<f8", 1), ("cooldown", "<f8", 1))
+ITEM_COLUMNS = (("kind", "u1", 1), ("pos", "<i4", 2), ("variant", "<i4", 1))
+
+
+def area_path(directory, coord):
+    return os.path.join(directory, f"area_{coord[0]}_{coord[1]}.bin")
+
+
+def _replace(path, chunks):
+    # Grava ao lado e troca no fim: quem lê nunca vê um arquivo pela metade
+    temp = path + ".tmp"
+    with open(temp, "wb") as file:
+        for chunk in chunks:
+            file.write(chunk)
+    os.replace(temp, path)
+    return sum(len(chunk) for chunk in chunks)
+
+
+def _columns(columns, count, arrays):
+    return [
+        np.ascontiguousarray(array, dtype=dtype).reshape(count, width).tobytes()
+        for (_, dtype, width), array in zip(columns, arrays)
+    ]
+
+
+def write_area(directory, coord, data):
+    # Só o que muda durante o jogo; chão e decorações saem de novo da seed
+    npcs, state, items = data["npcs"], data["npc_state"], data["items"]
+    chunks = [AREA_HEADER.pack(AREA_MAGIC, VERSION, coord[0], coord[1], len(npcs), len(items))]
+    chunks += _columns(NPC_COLUMNS, len(npcs), (npcs[:, 0], state[:, :2], state[:, 2], state[:, 3]))
+    chunks += _columns(ITEM_COLUMNS, len(items), (items[:, 0], items[:, 1:3], items[:, 3]))
+    return _replace(area_path(directory, coord), chunks)
+
+
+def _read_columns(columns, count, buffer, offset):
+    arrays = []
+    for _, dtype, width in columns:
+        array = np.frombuffer(buffer, dtype=dtype, count=count * width, offset=offset).reshape(count, width)
+        offset += array.nbytes
+        arrays.append(array)
+    return arrays, offset
+
+
+def read_area(path):
+    # Colunas no formato dormente do Area.build (npcs, npc_state, items)
+    with open(path, "rb") as file:
+        buffer = file.read()
+    magic, version, _, _, npc_count, item_count = AREA_HEADER.unpack_from(buffer)
+    if magic != AREA_MAGIC or version != VERSION:
+        raise ValueError(f"{path} não é uma área de checkpoint (versão {VERSION})")
+    (kind, pos, health, cooldown), offset = _read_columns(NPC_COLUMNS, npc_count, buffer, AREA_HEADER.size)
+    (item_kind, item_pos, variant), _ = _read_columns(ITEM_COLUMNS, item_count, buffer, offset)
+    return {
+        "npcs": np.column_stack((kind, np.zeros((npc_count, 2)))).astype(np.int32),
+        "npc_state": np.column_stack((pos, health, cooldown)),
+        "items": np.column_stack((item_kind, item_pos, variant)).astype(np.int32),
+    }
+
+
+class Checkpointer:
+    # Checkpoint do mundo inteiro sem travar o laço: a thread principal só tira os
+    # snapshots das áreas mudadas (arrays); serializar e gravar fica numa thread.
+    # Áreas que não mudaram desde o último save continuam com o arquivo anterior; as
+    # que nunca mudaram não têm arquivo e saem de novo da seed.
+    def __init__(self, directory=CHECKPOINT_DIR):
+        self.directory = directory
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self.pending = None
+        self.saved = set()
+        self.saves = 0
+        self.areas_written = 0
+        self.bytes_written = 0
+
+    def reset(self, saved=()):
+        # Novo mundo: arquivos antigos no diretório não valem mais (ou valem os do checkpoint carregado)
+        self.wait()
+        self.saved = set(saved)
+
+    def save(self, simulation):
+        # False se o save anterior ainda está gravando: as áreas continuam marcadas para o próximo
+        if self.pending is not None and not self.pending.done():
+            return False
+        world_grid = simulation.world_grid
+        changed = set(world_grid.dirty_areas)
+        # Áreas de um checkpoint de outro diretório: as já restauradas são gravadas do estado
+        # atual e as ainda não restauradas são copiadas na thread
+        copies = {}
+        if getattr(simulation, "checkpoint_dir", None) != self.directory:
+            restored = getattr(simulation, "checkpoint_areas", set()) - world_grid.saved_areas.keys()
+            changed |= restored - self.saved
+            copies = {coord: read for coord, read in world_grid.saved_areas.items() if coord not in self.saved}
+        states = world_grid.dormant_states(changed)
+        world_grid.dirty_areas -= states.keys()
+        self.saved |= states.keys() | copies.keys()
+        coords = sorted(self.saved | world_grid.saved_areas.keys())
+        player = simulation.player
+        rng_state = json.dumps(world_grid.lod_rng.bit_generator.state).encode()
+        header = WORLD_HEADER.pack(
+            WORLD_MAGIC,
+            VERSION,
+            simulation.seed,
+            simulation.tick_count,
+            simulation.elapsed,
+            STATES.index(simulation.state),
+            player.x,
+            player.y,
+            player.health,
+            player.ammo_items,
+            player.health_items,
+            len(coords),
+            len(rng_state),
+        )
+        chunks = [header, np.array(coords, dtype="<i4").reshape(-1, 2).tobytes(), rng_state]
+        self.pending = self.executor.submit(self._write, chunks, states, copies)
+        return True
+
+    def _write(self, header_chunks, states, copies):
+        os.makedirs(self.directory, exist_ok=True)
+        written = 0
+        for coord, data in states.items():
+            written += write_area(self.directory, coord, data)
+        for coord, read in copies.items():
+            written += write_area(self.directory, coord, read())
+        # Cabeçalho por último: aponta só para áreas já gravadas
+        written += _replace(os.path.join(self.directory, "world.bin"), header_chunks)
+        self.saves += 1
+        self.areas_written += len(states) + len(copies)
+        self.bytes_written += written
+
+    def wait(self):
+        if self.pending is not None:
+            self.pending.result()
+            self.pending = None
+
+    def close(self):
+        self.wait()
+        self.executor.shutdown(wait=True)
+
+    def stats(self):
+        return {"saves": self.saves, "areas_written": self.areas_written, "bytes_written": self.bytes_written}
+
+
+def load_checkpoint(directory=CHECKPOINT_DIR, streaming=False, workers=SIM_WORKERS, cache_dir=None):
+    # Restaura jogador e relógio na hora e carrega só a vizinhança do jogador; as outras
+    # áreas salvas são lidas do disco quando forem ativadas
+    with open(os.path.join(directory, "world.bin"), "rb") as file:
+        buffer = file.read()
+    (
+        magic, version, seed, tick_count, elapsed, state, x, y, health, ammo_items, health_items, area_count, rng_length
+    ) = WORLD_HEADER.unpack_from(buffer)
+    if magic != WORLD_MAGIC or version != VERSION:
+        raise ValueError(f"{directory} não contém um checkpoint (versão {VERSION})")
+    offset = WORLD_HEADER.size
+    coords = np.frombuffer(buffer, dtype="<i4", count=area_count * 2, offset=offset).reshape(-1, 2).tolist()
+    offset += area_count * 8
+    rng_state = json.loads(buffer[offset:offset + rng_length])
+
+    simulation = Simulation(seed, streaming, workers, cache_dir)
+    simulation.checkpoint_dir = directory
+    simulation.checkpoint_areas = {tuple(coord) for coord in coords}
+    simulation.tick_count = tick_count
+    simulation.elapsed = elapsed
+    simulation.state = STATES[state]
+    player = simulation.player
+    player.x = player.prev_x = x
+    player.y = player.prev_y = y
+    player.rect.x, player.rect.y = int(x), int(y)
+    player.health = health
+    player.is_alive = health > 0
+    player.ammo_items = ammo_items
+    player.health_items = health_items
+    world_grid = simulation.world_grid
+    world_grid.lod_rng.bit_generator.state = rng_state
+    world_grid.saved_areas = {tuple(coord): partial(read_area, area_path(directory, coord)) for coord in coords}
+    world_grid.update_active_areas(player.x, player.y)
+    return simulation
@@ -0,0 +1,65 @@
+import pygame
+
+from settings import BLACK, COMPOSITOR_BUFFER_CACHE
+
+
+class Compositor:
+    # Junta o mundo com a tela. No modo com buffer o mundo é desenhado em resolução
+    # de jogo e escalado para um buffer pré-alocado (sem Surface nova por frame).
+    # No modo direto o Viewport escala os sprites (cache por zoom) e o mundo vai
+    # direto para a tela, sem passo de escala.
+    def __init__(self, screen_width, screen_height, zoom, direct=False):
+        self.direct = direct
+        self.buffers = {}
+        self.screen_size = (screen_width, screen_height)
+        self.zoom = zoom
+        self._allocate()
+
+    @property
+    def world_size(self):
+        return int(self.screen_size[0] / self.zoom), int(self.screen_size[1] / self.zoom)
+
+    @property
+    def view_zoom(self):
+        return self.zoom if self.direct else 1
+
+    def _buffer(self, size):
+        # Poucos tamanhos em uso (um por zoom): alternar zoom reaproveita os buffers
+        surface = self.buffers.pop(size, None)
+        if surface is None:
+            surface = pygame.Surface(size)
+            surface.set_colorkey(BLACK)
+        self.buffers[size] = surface
+        while len(self.buffers) > COMPOSITOR_BUFFER_CACHE:
+            del self.buffers[next(iter(self.buffers))]
+        return surface
+
+    def _allocate(self):
+        if self.direct:
+            self.world_surface = self.scaled_surface = None
+            return
+        self.world_surface = self._buffer(self.world_size)
+        self.scaled_surface = self._buffer(self.screen_size) if self.zoom != 1 else None
+
+    def resize(self, screen_width, screen_height):
+        self.screen_size = (screen_width, screen_height)
+        self._allocate()
+
+    def set_zoom(self, zoom):
+        self.zoom = zoom
+        self._allocate()
+
+    def begin(self, screen):
+        if self.direct:
+            return screen
+        self.world_surface.fill(BLACK)
+        return self.world_surface
+
+    def present(self, screen):
+        if self.direct:
+            return
+        if self.scaled_surface is None:
+            screen.blit(self.world_surface, (0, 0))
+            return
+        pygame.transform.scale(self.world_surface, self.screen_size, self.scaled_surface)
+        screen.blit(self.scaled_surface, (0, 0))
@@ -0,0 +1,117 @@
+import math
+
+import numpy as np
+import pygame
+
+from settings import (
+    AMMO_RADIUS,
+    EFFECT_ALPHA_STEPS,
+    PARTICLE_POOL_SIZE,
+    GREEN,
+    RED,
+    YELLOW,
+)
+
+BLAST, HIT, PICKUP = 0, 1, 2
+# (cor, raio, alpha inicial) de cada tipo de partícula; o alpha cai até 0 durante a vida
+KINDS = {
+    BLAST: (YELLOW, AMMO_RADIUS, 150),
+    HIT: (RED, 3, 255),
+    PICKUP: (GREEN, 2, 230),
+}
+
+
+class EffectSprites:
+    # Cada tipo pré-desenhado em `steps` níveis de alpha, numa lista plana indexada por
+    # tipo * steps + nível: nenhuma Surface é criada durante o jogo
+    def __init__(self, steps=EFFECT_ALPHA_STEPS):
+        self.steps = steps
+        self.images = []
+        self.radius = np.zeros(len(KINDS), dtype=np.int64)
+        for kind in sorted(KINDS):
+            color, radius, alpha = KINDS[kind]
+            self.radius[kind] = radius
+            for level in range(steps):
+                image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(image, (*color, alpha * (steps - level) // steps), (radius, radius), radius)
+                self.images.append(image)
+
+
+class ParticlePool:
+    # Partículas pré-alocadas em arrays (posição, velocidade, vida, tipo). As vivas ficam
+    # sempre no prefixo [0, count): atualizar e desenhar é uma operação em lote sobre ele.
+    def __init__(self, capacity=PARTICLE_POOL_SIZE, sprites=None):
+        self.capacity = capacity
+        self.sprites = sprites if sprites is not None else EffectSprites()
+        self.count = 0
+        self.dropped = 0
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.life = np.zeros(capacity)
+        self.max_life = np.ones(capacity)
+        self.kind = np.zeros(capacity, dtype=np.int64)
+
+    def emit(self, kind, x, y, count=1, speed=0.0, life=0.3):
+        # `count` partículas num anel em volta de (x, y); sem espaço no pool, as que sobram são descartadas
+        emitted = min(count, self.capacity - self.count)
+        self.dropped += count - emitted
+        if not emitted:
+            return 0
+        part = slice(self.count, self.count + emitted)
+        angle = np.linspace(0, 2 * math.pi, emitted, endpoint=False)
+        self.pos[part] = (x, y)
+        self.vel[part, 0] = np.cos(angle) * speed
+        self.vel[part, 1] = np.sin(angle) * speed
+        self.life[part] = self.max_life[part] = life
+        self.kind[part] = kind
+        self.count += emitted
+        return emitted
+
+    def blast(self, x, y):
+        self.emit(BLAST, x, y, life=0.2)
+        self.emit(HIT, x, y, count=24, speed=AMMO_RADIUS * 4, life=0.25)
+
+    def hit(self, x, y):
+        self.emit(HIT, x, y, count=8, speed=60, life=0.3)
+
+    def pickup(self, x, y):
+        self.emit(PICKUP, x, y, count=12, speed=40, life=0.4)
+
+    def update(self, dt):
+        n = self.count
+        if not n:
+            return
+        self.pos[:n] += self.vel[:n] * dt
+        self.life[:n] -= dt
+        alive = self.life[:n] > 0
+        if alive.all():
+            return
+        # Compacta as vivas no começo dos arrays
+        kept = int(np.count_nonzero(alive))
+        for array in (self.pos, self.vel, self.life, self.max_life, self.kind):
+            array[:kept] = array[:n][alive]
+        self.count = kept
+
+    def clear(self):
+        self.count = 0
+
+    def draw(self, surface, viewport):
+        n = self.count
+        if not n:
+            return
+        sprites = self.sprites
+        steps = sprites.steps
+        kind = self.kind[:n]
+        radius = sprites.radius[kind]
+        topleft = self.pos[:n].astype(np.int64) - radius[:, None]
+        visible = np.flatnonzero(viewport.visible_mask(topleft, np.column_stack((radius, radius)) * 2))
+        if not len(visible):
+            return
+        level = ((1 - self.life[visible] / self.max_life[visible]) * steps).astype(np.int64)
+        indices = (kind[visible] * steps + np.minimum(level, steps - 1)).tolist()
+        screen = viewport.to_screen(topleft[visible]).tolist()
+        images = sprites.images
+        surface.blits(
+            [(viewport.scale(images[index]), (sx, sy)) for index, (sx, sy) in zip(indices, screen)],
+            doreturn=False,
+        )
@@ -0,0 +1,42 @@
+import numpy as np
+
+
+class AnimationClock:
+    # Um relógio só para todas as animações. Cada entidade guarda (animation_id, fase)
+    # e o frame sai de aritmética sobre o tempo global: sem get_ticks nem last_update
+    # por entidade, e em lote para arrays de ids.
+    def __init__(self):
+        self.time = 0
+        self.frames = []
+        self.offsets = np.zeros(0, dtype=np.int64)
+        self.lengths = np.zeros(0, dtype=np.int64)
+        self.frame_ms = np.zeros(0, dtype=np.int64)
+
+    def register(self, frames, frame_ms):
+        animation_id = len(self.lengths)
+        self.offsets = np.append(self.offsets, len(self.frames))
+        self.lengths = np.append(self.lengths, len(frames))
+        self.frame_ms = np.append(self.frame_ms, max(1, int(frame_ms)))
+        self.frames.extend(frames)
+        return animation_id
+
+    def advance(self, dt):
+        self.time += int(round(dt * 1000))
+
+    def start_phase(self, animation_id):
+        # Fase que faz a animação começar no frame 0 agora
+        return -(self.time // int(self.frame_ms[animation_id]))
+
+    def frame(self, animation_id, phase=0):
+        ticks = self.time // int(self.frame_ms[animation_id])
+        index = (ticks + phase) % int(self.lengths[animation_id])
+        return self.frames[int(self.offsets[animation_id]) + index]
+
+    def frames_for(self, animation_ids, phases):
+        ticks = self.time // self.frame_ms[animation_ids]
+        indices = self.offsets[animation_ids] + (ticks + phases) % self.lengths[animation_ids]
+        frames = self.frames
+        return [frames[index] for index in indices.tolist()]
+
+
+animation_clock = AnimationClock()
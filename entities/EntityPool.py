@@ -0,0 +1,40 @@
+from settings import ENTITY_POOL_MAX
+
+
+class EntityPool:
+    # Instâncias de NPC e Item reaproveitadas entre load/unload de áreas: acquire
+    # chama reset() com os mesmos argumentos do construtor.
+    def __init__(self, max_per_type=ENTITY_POOL_MAX):
+        self.max_per_type = max_per_type
+        self.free = {}
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, cls, *args):
+        free = self.free.get(cls)
+        if free:
+            entity = free.pop()
+            entity.reset(*args)
+            self.reused += 1
+            return entity
+        self.created += 1
+        return cls(*args)
+
+    def release(self, entity):
+        entity.release()
+        free = self.free.setdefault(type(entity), [])
+        if len(free) < self.max_per_type:
+            free.append(entity)
+
+    def clear(self):
+        self.free.clear()
+
+    def stats(self):
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "pooled": sum(len(free) for free in self.free.values()),
+        }
+
+
+entity_pool = EntityPool()
@@ -1,35 +1,39 @@
 import os
-import random
 import pygame
-from sprites import SpriteSheet
+from sprites import asset_registry
 from settings import (
     GREEN,
     YELLOW,
 )
 class Item:
-    def __init__(self, x, y, item_type):
+    __slots__ = ("item_type", "variant", "image", "rect", "collected", "index_key", "list_index")
+
+    def __init__(self, x, y, item_type, variant=0):
+        self.reset(x, y, item_type, variant)
+
+    def reset(self, x, y, item_type, variant=0):
         self.item_type = item_type
+        self.variant = variant
         if item_type == "health":
             img_path = "assets/health.png"
             self.image = self._load_or_fallback(img_path, GREEN)
         elif item_type == "ammo":
             img_path = "assets/ammunition.png"
             if os.path.exists(img_path):
-                sheet = SpriteSheet(img_path)
-                frames = [sheet.get_image(i * 16, 0, 16, 16) for i in range(3)]
-                self.image = random.choice(frames)
+                frames = asset_registry.get_strip(img_path, 16, 16, 3)
+                self.image = frames[variant % len(frames)]
             else:
                 self.image = self._make_fallback_surface(YELLOW)
         else:
             self.image = self._make_fallback_surface((128, 128, 128))
         self.rect = self.image.get_rect(topleft=(x, y))
         self.collected = False
+        self.index_key = None
+        self.list_index = None
 
     def _load_or_fallback(self, path, color):
         if os.path.exists(path):
-            img = pygame.image.load(path).convert_alpha()
-            w, h = img.get_size()
-            return pygame.transform.scale(img, (w, h))
+            return asset_registry.get_sheet(path)
         return self._make_fallback_surface(color)
 
     @staticmethod
@@ -38,11 +42,9 @@ class Item:
         surf.fill(color)
         return surf
 
-    def draw(self, surface, viewport):
-        if self.collected:
-            return
-        sx, sy = viewport.world_to_screen(self.rect.x, self.rect.y)
-        surface.blit(self.image, (sx, sy))
-
     def get_rect(self):
         return self.rect
+
+    def release(self):
+        self.index_key = None
+        self.list_index = None
@@ -1,5 +1,4 @@
-import pygame
-
+from entities.AnimationClock import animation_clock
 from entities.Npc.NPC import NPC
 from sprites import SpriteSheet
 from settings import (
@@ -9,32 +8,20 @@ from settings import (
 
 )
 class Droid(NPC):
-    def __init__(self, x, y, area):
-        super().__init__(x, y, area)
-        self.spritesheet = SpriteSheet("assets/DroidSheet.png")
-        self.frame_width = self.frame_height = 32
-        self.animation = []
-        self._load_animation()
-        self.image = self.animation[0]
-        self.rect = self.image.get_rect(topleft=(x, y))
-        self.health = self.max_health = NPC_HEALTH * 1.5
-        self.speed = NPC_SPEED * 0.8
-        self.damage = NPC_DAMAGE * 1.5
-        self.animation_speed = 150
-        self.current_frame = 0
-        self.last_update = pygame.time.get_ticks()
+    __slots__ = ()
+    frame_width = frame_height = 32
+    animation_speed = 150
+    animation = None
 
-    def _load_animation(self):
-        for i in range(6):
-            self.animation.append(
-                self.spritesheet.get_image(i * self.frame_width, 0, self.frame_width, self.frame_height)
-            )
+    def reset(self, x, y, area):
+        super().reset(x, y, area, self._load_animation(), NPC_HEALTH * 1.5, NPC_SPEED * 0.8, NPC_DAMAGE * 1.5)
 
-    def _animate(self):
-        now = pygame.time.get_ticks()
-        if now - self.last_update > self.animation_speed:
-            self.last_update = now
-            self.current_frame = (self.current_frame + 1) % len(self.animation)
-            center = self.rect.center
-            self.image = self.animation[self.current_frame]
-            self.rect = self.image.get_rect(center=center)
+    @classmethod
+    def _load_animation(cls):
+        if cls.animation is None:
+            spritesheet = SpriteSheet("assets/DroidSheet.png")
+            cls.animation = animation_clock.register(
+                [spritesheet.get_image(i * cls.frame_width, 0, cls.frame_width, cls.frame_height) for i in range(6)],
+                cls.animation_speed,
+            )
+        return cls.animation
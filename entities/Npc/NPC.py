@@ -1,64 +1,66 @@
-import math
 import pygame
+from entities.AnimationClock import animation_clock
 from settings import (
-    NPC_SIZE,
-    RED,
     AREA_WIDTH,
     AREA_HEIGHT,
-    GREEN,
 )
 
 
 class NPC:
-    def __init__(self, x, y, area, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.rect = pygame.Rect(x, y, NPC_SIZE, NPC_SIZE)
-        self.is_alive = True
-        self.damage_cooldown = 2.0
+    # View fina sobre um slot do NPCEngine: a simulação acontece em lote no engine,
+    # aqui fica só o desenho. Tabelas de animação são por tipo (classe) e o frame
+    # atual sai do animation_clock; as instâncias são reaproveitadas pelo entity_pool.
+    __slots__ = ("area", "engine", "slot")
+
+    def __init__(self, *args):
+        self.reset(*args)
+
+    def reset(self, x, y, area, animation_id, health, speed, damage):
         self.area = area
-        self.area_rect = pygame.Rect(area.world_x, area.world_y, AREA_WIDTH, AREA_HEIGHT)
+        self.engine = area.npc_engine
+        width, height = animation_clock.frame(animation_id).get_size()
+        bounds = (area.world_x, area.world_y, area.world_x + AREA_WIDTH, area.world_y + AREA_HEIGHT)
+        self.slot = self.engine.spawn(x, y, width, height, health, speed, damage, bounds)
+        self.engine.anim[self.slot] = animation_id
+        self.engine.phase[self.slot] = animation_clock.start_phase(animation_id)
+
+    @property
+    def image(self):
+        return animation_clock.frame(int(self.engine.anim[self.slot]), int(self.engine.phase[self.slot]))
+
+    @property
+    def rect(self):
+        x, y = self.engine.pos[self.slot]
+        width, height = self.engine.size[self.slot]
+        return pygame.Rect(int(x), int(y), int(width), int(height))
+
+    @property
+    def is_alive(self):
+        return bool(self.engine.alive[self.slot])
+
+    @property
+    def health(self):
+        return float(self.engine.health[self.slot])
+
+    @property
+    def max_health(self):
+        return float(self.engine.max_health[self.slot])
 
-    def update(self, dt, player):
-        if not self.is_alive:
-            return
-        dx = player.rect.centerx - self.rect.centerx
-        dy = player.rect.centery - self.rect.centery
-        dist = math.hypot(dx, dy) or 1
-        self.rect.x += self.speed * dt * dx / dist
-        self.rect.y += self.speed * dt * dy / dist
-        self.rect.clamp_ip(self.area_rect)
-        self._animate()
-        if not self.area_rect.collidepoint(player.rect.center):
-            return
-        if self.damage_cooldown > 0:
-            self.damage_cooldown -= dt
+    @property
+    def speed(self):
+        return float(self.engine.speed[self.slot])
 
-    def attack_player(self, player):
-        # Dano por contato se houver colisão
-        if self.is_alive and self.damage_cooldown <= 0:
-            if player.get_rect().colliderect(self.rect):
-                player.take_damage(self.damage)
-                self.damage_cooldown = 1.0
-                return True
-        return False
+    @property
+    def damage(self):
+        return float(self.engine.damage[self.slot])
 
-    def draw(self, surface, viewport):
-        if not self.is_alive:
-            return
-        sx, sy = viewport.world_to_screen(self.rect.x, self.rect.y)
-        surface.blit(self.image, (sx, sy))
-        if self.health < self.max_health:
-            pct = self.health / self.max_health
-            bar_x, bar_y = sx, sy - 7
-            pygame.draw.rect(surface, RED, (bar_x, bar_y, self.rect.width, 4))
-            pygame.draw.rect(surface, GREEN, (bar_x, bar_y, self.rect.width * pct, 4))
+    @property
+    def damage_cooldown(self):
+        return float(self.engine.cooldown[self.slot])
 
     def take_damage(self, dmg):
-        if self.is_alive:
-            self.health -= dmg
-            if self.health <= 0:
-                self.health = 0
-                self.is_alive = False
+        self.engine.take_damage(self.slot, dmg)
 
-    def _animate(self):
-        pass
\ No newline at end of file
+    def release(self):
+        self.engine.release(self.slot)
+        self.area = None
@@ -0,0 +1,234 @@
+import numpy as np
+
+from settings import SPATIAL_CELL_SIZE, PARALLEL_MIN_NPCS
+from world.SpatialHash import SpatialHash
+
+
+def _clamp_walls(pos, start, size, flow_field):
+    # Centro não entra em tile bloqueado: tenta manter só o eixo x, depois só o y
+    # (desliza pela parede); sem nenhum dos dois o NPC fica onde estava
+    blocked = np.flatnonzero(~flow_field.walkable_at(pos + size / 2))
+    if not len(blocked):
+        return
+    half = size[blocked] / 2
+    moved, origin = pos[blocked], start[blocked]
+    only_x = np.column_stack((moved[:, 0], origin[:, 1]))
+    only_y = np.column_stack((origin[:, 0], moved[:, 1]))
+    keep_x = flow_field.walkable_at(only_x + half)
+    keep_y = ~keep_x & flow_field.walkable_at(only_y + half)
+    pos[blocked] = np.where(keep_x[:, None], only_x, np.where(keep_y[:, None], only_y, origin))
+
+
+def move_slots(state, slots, dt, px, py, flow_field=None):
+    # Núcleo do movimento, compartilhado pelo caminho serial e pelos processos do
+    # ParallelMover. Só operações elemento a elemento: o resultado de cada NPC não
+    # depende de quais outros slots estão no mesmo lote.
+    # Perseguição: em linha reta para o centro do jogador, ou pelo campo de fluxo
+    # nos tiles onde a linha reta está bloqueada
+    pos = state.pos[slots]
+    size = state.size[slots]
+    centers = pos + size / 2
+    delta = np.array((px, py), dtype=np.float64) - centers
+    dist = np.hypot(delta[:, 0], delta[:, 1])
+    dist[dist == 0] = 1
+    speed = state.speed[slots]
+    vel = delta * (speed / dist)[:, None]
+    if flow_field is not None:
+        steer, follow = flow_field.sample(centers)
+        vel[follow] = steer[follow] * speed[follow, None]
+    start = pos.copy()
+    pos += vel * dt[:, None]
+    bounds = state.bounds[slots]
+    np.clip(pos, bounds[:, :2], bounds[:, 2:] - size, out=pos)
+    if flow_field is not None and not flow_field.open:
+        _clamp_walls(pos, start, size, flow_field)
+    state.pos[slots] = pos
+    state.vel[slots] = vel
+
+    # Cooldown só corre enquanto o jogador está dentro da área do NPC
+    cooldown = state.cooldown[slots]
+    inside = (
+        (bounds[:, 0] <= px) & (px < bounds[:, 2])
+        & (bounds[:, 1] <= py) & (py < bounds[:, 3])
+    )
+    ticking = inside & (cooldown > 0)
+    cooldown[ticking] -= dt[ticking]
+    state.cooldown[slots] = cooldown
+
+
+class NPCEngine:
+    # Estado de todos os NPCs em arrays contíguos (structure-of-arrays).
+    # Cada NPC ocupa um slot; slots liberados são reaproveitados.
+    FIELDS = {
+        "pos": (2, np.float64),
+        # Posição no fim do tick anterior, para interpolar o desenho entre dois ticks
+        "prev_pos": (2, np.float64),
+        "vel": (2, np.float64),
+        "size": (2, np.float64),
+        "bounds": (4, np.float64),
+        "health": (None, np.float64),
+        "max_health": (None, np.float64),
+        "cooldown": (None, np.float64),
+        "speed": (None, np.float64),
+        "damage": (None, np.float64),
+        "alive": (None, np.bool_),
+        "active": (None, np.bool_),
+        "anim": (None, np.int64),
+        "phase": (None, np.int64),
+    }
+    INITIAL_COOLDOWN = 2.0
+    ATTACK_COOLDOWN = 1.0
+
+    def __init__(self, capacity=64, cell_size=SPATIAL_CELL_SIZE, parallel=None):
+        # parallel: ParallelMover opcional; os arrays passam a viver na memória compartilhada dele
+        self.parallel = parallel
+        self.capacity = 0
+        self.count = 0
+        self.free_slots = []
+        self.deaths = 0
+        self._grow(capacity)
+        # Só NPCs vivos e ativos ficam no índice espacial
+        self.index = SpatialHash(cell_size, capacity)
+
+    def _grow(self, capacity):
+        for name, (width, dtype) in self.FIELDS.items():
+            shape = (capacity,) if width is None else (capacity, width)
+            if self.parallel is not None:
+                array = self.parallel.arena.zeros(name, shape, dtype)
+            else:
+                array = np.zeros(shape, dtype=dtype)
+            if self.capacity:
+                array[: self.capacity] = getattr(self, name)
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def spawn(self, x, y, width, height, health, speed, damage, bounds):
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            if self.count == self.capacity:
+                self._grow(self.capacity * 2)
+            slot = self.count
+            self.count += 1
+        self.pos[slot] = self.prev_pos[slot] = (x, y)
+        self.vel[slot] = 0.0
+        self.size[slot] = (width, height)
+        self.bounds[slot] = bounds
+        self.health[slot] = self.max_health[slot] = health
+        self.cooldown[slot] = self.INITIAL_COOLDOWN
+        self.speed[slot] = speed
+        self.damage[slot] = damage
+        self.alive[slot] = True
+        self.active[slot] = False
+        return slot
+
+    def restore(self, slot, x, y, health, cooldown):
+        self.pos[slot] = self.prev_pos[slot] = (x, y)
+        self.health[slot] = health
+        self.cooldown[slot] = cooldown
+        self.alive[slot] = health > 0
+
+    def release(self, slot):
+        self.alive[slot] = False
+        self.active[slot] = False
+        self.index.remove(slot)
+        self.free_slots.append(slot)
+
+    def set_active(self, slots, active):
+        self.active[slots] = active
+        for slot in np.asarray(slots, dtype=np.intp).tolist():
+            if active and self.alive[slot]:
+                x, y = self.pos[slot]
+                width, height = self.size[slot]
+                self.index.insert(slot, x, y, width, height)
+            else:
+                self.index.remove(slot)
+
+    def _kill(self, slot):
+        self.health[slot] = 0
+        self.alive[slot] = False
+        self.index.remove(slot)
+        self.deaths += 1
+
+    def take_damage(self, slot, amount):
+        if not self.alive[slot]:
+            return
+        self.health[slot] -= amount
+        if self.health[slot] <= 0:
+            self._kill(slot)
+
+    def damage_many(self, slots, amount):
+        slots = slots[self.alive[slots]]
+        self.health[slots] -= amount
+        for slot in slots[self.health[slots] <= 0].tolist():
+            self._kill(slot)
+        return len(slots)
+
+    def save_positions(self):
+        self.prev_pos[: self.count] = self.pos[: self.count]
+
+    def render_positions(self, slots, alpha=1.0):
+        # alpha: fração do próximo tick já decorrida (1 = estado atual, sem interpolar)
+        if alpha >= 1:
+            return self.pos[slots]
+        prev = self.prev_pos[slots]
+        return prev + (self.pos[slots] - prev) * alpha
+
+    def query_radius(self, x, y, radius):
+        return self.index.query_radius(x, y, radius)
+
+    def query_rect(self, rect):
+        return self.index.query_rect(rect.x, rect.y, rect.width, rect.height)
+
+    def move(self, slots, dt, player, flow_field=None):
+        # dt pode ser escalar ou um valor por slot (áreas em ritmo reduzido)
+        slots = slots[self.alive[slots]]
+        if not len(slots):
+            return
+        dt = np.broadcast_to(np.asarray(dt, dtype=np.float64), (len(slots),))
+        px, py = player.get_rect().center
+        if (
+            self.parallel is not None
+            and len(slots) >= PARALLEL_MIN_NPCS
+            and (flow_field is None or flow_field.open)
+        ):
+            # Sem paredes o campo de fluxo não desvia ninguém: os processos só precisam do jogador
+            self.parallel.move(slots, dt, px, py)
+        else:
+            move_slots(self, slots, dt, px, py, flow_field)
+        self.index.update(slots, self.pos[slots], self.size[slots])
+
+    def drift(self, slots, dt, rng, amount=0.25):
+        # Atualização estatística para áreas longe do jogador: passeio aleatório
+        # limitado à área, sem perseguição, índice espacial nem dano
+        slots = slots[self.alive[slots]]
+        if not len(slots):
+            return
+        angle = rng.uniform(0, 2 * np.pi, len(slots))
+        step = self.speed[slots] * dt * amount
+        pos = self.pos[slots] + np.column_stack((np.cos(angle), np.sin(angle))) * step[:, None]
+        bounds = self.bounds[slots]
+        np.clip(pos, bounds[:, :2], bounds[:, 2:] - self.size[slots], out=pos)
+        self.pos[slots] = pos
+        self.vel[slots] = 0.0
+
+    def attack(self, player):
+        # Dano por contato: só os candidatos do índice perto do jogador
+        if not player.is_alive:
+            return 0
+        player_rect = player.get_rect()
+        near = self.query_rect(player_rect)
+        if not len(near):
+            return 0
+        left = np.floor(self.pos[near, 0])
+        top = np.floor(self.pos[near, 1])
+        size = self.size[near]
+        touching = (
+            (left < player_rect.right) & (left + size[:, 0] > player_rect.left)
+            & (top < player_rect.bottom) & (top + size[:, 1] > player_rect.top)
+        )
+        attacking = near[touching & (self.cooldown[near] <= 0)]
+        if len(attacking):
+            player.take_damage(float(self.damage[attacking].sum()))
+            self.cooldown[attacking] = self.ATTACK_COOLDOWN
+        return len(attacking)
@@ -0,0 +1,164 @@
+import multiprocessing
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+
+import numpy as np
+
+from entities.Npc.NPCEngine import move_slots
+
+# Bloco de controle (float64): geração do layout, parada, posição do jogador e o
+# intervalo [início, fim) da lista de trabalho de cada processo
+GENERATION, STOP, PLAYER_X, PLAYER_Y, RANGES = range(5)
+MOVE_FIELDS = ("pos", "vel", "size", "bounds", "speed", "cooldown", "work_slots", "work_dt")
+
+
+class SharedArena:
+    # Arrays numpy sobre blocos de multiprocessing.shared_memory, um bloco por campo.
+    # Crescer um campo cria um bloco novo e sobe a geração: os processos reabrem pelo nome.
+    def __init__(self):
+        self.blocks = {}
+        self.layout = {}
+        self.retired = []
+        self.generation = 0
+
+    def zeros(self, name, shape, dtype):
+        dtype = np.dtype(dtype)
+        nbytes = max(1, int(np.prod(shape)) * dtype.itemsize)
+        block = shared_memory.SharedMemory(create=True, size=nbytes)
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.fill(0)
+        if name in self.blocks:
+            self.retired.append(self.blocks[name])
+        self.blocks[name] = block
+        self.layout[name] = (block.name, tuple(shape), dtype.str)
+        self.generation += 1
+        return array
+
+    def collect(self):
+        # Blocos antigos só fecham quando ninguém mais aponta para eles
+        still_used = []
+        for block in self.retired:
+            try:
+                block.close()
+                block.unlink()
+            except BufferError:
+                still_used.append(block)
+        self.retired = still_used
+
+    def close(self):
+        for block in list(self.blocks.values()) + self.retired:
+            try:
+                block.close()
+            except BufferError:
+                pass
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self.blocks.clear()
+        self.retired = []
+
+
+def _attach(layout):
+    blocks, arrays = [], {}
+    for name in MOVE_FIELDS:
+        block_name, shape, dtype = layout[name]
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return blocks, SimpleNamespace(**arrays)
+
+
+def _worker(index, control_name, workers, barrier, layouts):
+    control_block = shared_memory.SharedMemory(name=control_name)
+    control = np.ndarray((RANGES + 2 * workers,), dtype=np.float64, buffer=control_block.buf)
+    blocks, state, generation = [], None, -1
+    while True:
+        barrier.wait()
+        if control[STOP]:
+            break
+        if control[GENERATION] != generation:
+            generation, layout = layouts.get()
+            state = None
+            for block in blocks:
+                block.close()
+            blocks, state = _attach(layout)
+        start, end = int(control[RANGES + 2 * index]), int(control[RANGES + 2 * index + 1])
+        if end > start:
+            move_slots(
+                state, state.work_slots[start:end], state.work_dt[start:end], control[PLAYER_X], control[PLAYER_Y]
+            )
+        barrier.wait()
+    state = None
+    for block in blocks:
+        block.close()
+    del control
+    control_block.close()
+
+
+class ParallelMover:
+    # Divide o movimento dos NPCs entre processos. O estado do NPCEngine vive na
+    # arena compartilhada; a cada tick a lista de slots vai para um buffer
+    # compartilhado, cada processo move o seu trecho e uma barreira sincroniza a volta.
+    def __init__(self, workers):
+        self.workers = workers
+        self.arena = SharedArena()
+        self.engine = None
+        self.sent_generation = -1
+        context = multiprocessing.get_context("spawn")
+        self.control_block = shared_memory.SharedMemory(create=True, size=(RANGES + 2 * workers) * 8)
+        self.control = np.ndarray((RANGES + 2 * workers,), dtype=np.float64, buffer=self.control_block.buf)
+        self.control.fill(0)
+        self.barrier = context.Barrier(workers + 1)
+        self.layouts = [context.Queue() for _ in range(workers)]
+        self.processes = [
+            context.Process(
+                target=_worker,
+                args=(index, self.control_block.name, workers, self.barrier, self.layouts[index]),
+                daemon=True,
+            )
+            for index in range(workers)
+        ]
+        for process in self.processes:
+            process.start()
+        self.work_capacity = 0
+
+    def _reserve(self, count):
+        if count > self.work_capacity:
+            self.work_capacity = max(count, self.work_capacity * 2, 1024)
+            self.work_slots = self.arena.zeros("work_slots", (self.work_capacity,), np.int64)
+            self.work_dt = self.arena.zeros("work_dt", (self.work_capacity,), np.float64)
+
+    def move(self, slots, dt, px, py):
+        count = len(slots)
+        self._reserve(count)
+        self.arena.collect()
+        self.work_slots[:count] = slots
+        self.work_dt[:count] = dt
+        if self.arena.generation != self.sent_generation:
+            self.sent_generation = self.arena.generation
+            self.control[GENERATION] = self.sent_generation
+            for queue in self.layouts:
+                queue.put((self.sent_generation, dict(self.arena.layout)))
+        self.control[PLAYER_X] = px
+        self.control[PLAYER_Y] = py
+        # Trechos contíguos do mesmo tamanho: as áreas chegam concatenadas, então
+        # cada processo recebe áreas inteiras ou pedaços de uma (NPCs são independentes)
+        bounds = np.linspace(0, count, self.workers + 1).astype(np.int64)
+        self.control[RANGES::2] = bounds[:-1]
+        self.control[RANGES + 1::2] = bounds[1:]
+        self.barrier.wait()
+        self.barrier.wait()
+
+    def shutdown(self):
+        if not self.processes:
+            return
+        self.control[STOP] = 1
+        self.barrier.wait()
+        for process in self.processes:
+            process.join(timeout=5)
+        self.processes = []
+        del self.control
+        self.control_block.close()
+        self.control_block.unlink()
+        self.arena.close()
@@ -1,5 +1,4 @@
-import pygame
-
+from entities.AnimationClock import animation_clock
 from entities.Npc.NPC import NPC
 from sprites import SpriteSheet
 from settings import (
@@ -9,38 +8,33 @@ from settings import (
 )
 
 class Spider(NPC):
-    def __init__(self, x, y, area):
-        super().__init__(x, y, area)
-        self.spritesheet = SpriteSheet("assets/SpiderSheet.png")
-        self.frame_width = self.frame_height = 32
-        self.animations = {"idle": [], "walking": []}
-        self._load_animations()
-        self.state = "walking"
-        self.image = self.animations["walking"][0]
-        self.rect = self.image.get_rect(topleft=(x, y))
-        self.health = self.max_health = NPC_HEALTH * 0.8
-        self.speed = NPC_SPEED * 1.2
-        self.damage = NPC_DAMAGE * 0.7
-        self.animation_speed = 100
-        self.current_frame = 0
-        self.last_update = pygame.time.get_ticks()
+    __slots__ = ()
+    frame_width = frame_height = 32
+    animation_speed = 100
+    state = "walking"
+    animations = None
 
-    def _load_animations(self):
-        for i in range(6):
-            self.animations["idle"].append(
-                self.spritesheet.get_image(i * self.frame_width, 0, self.frame_width, self.frame_height)
-            )
-        for i in range(6):
-            self.animations["walking"].append(
-                self.spritesheet.get_image(i * self.frame_width, self.frame_height, self.frame_width, self.frame_height)
-            )
+    def reset(self, x, y, area):
+        animations = self._load_animations()
+        super().reset(
+            x, y, area, animations[self.state], NPC_HEALTH * 0.8, NPC_SPEED * 1.2, NPC_DAMAGE * 0.7
+        )
 
-    def _animate(self):
-        now = pygame.time.get_ticks()
-        seq = self.animations[self.state]
-        if now - self.last_update > self.animation_speed:
-            self.last_update = now
-            self.current_frame = (self.current_frame + 1) % len(seq)
-            center = self.rect.center
-            self.image = seq[self.current_frame]
-            self.rect = self.image.get_rect(center=center)
+    @classmethod
+    def _load_animations(cls):
+        # Frames registrados uma vez por tipo no animation_clock; guarda só os ids
+        if cls.animations is None:
+            spritesheet = SpriteSheet("assets/SpiderSheet.png")
+            cls.animations = {
+                state: animation_clock.register(
+                    [
+                        spritesheet.get_image(
+                            i * cls.frame_width, row * cls.frame_height, cls.frame_width, cls.frame_height
+                        )
+                        for i in range(6)
+                    ],
+                    cls.animation_speed,
+                )
+                for row, state in enumerate(("idle", "walking"))
+            }
+        return cls.animations
@@ -1,5 +1,5 @@
-import math
 import pygame
+from entities.AnimationClock import animation_clock
 from sprites import SpriteSheet
 from settings import (
     PLAYER_MAX_HEALTH,
@@ -15,28 +15,33 @@ from settings import (
 )
 
 class Player:
+    frame_width = frame_height = 32
+    animation_speed = 120
+    animations = None
+
     def __init__(self, x, y):
         self.is_alive = True
-        self.spritesheet = SpriteSheet("assets/PlayerSheet.png")
-        self.animations = {}
-        self.frame_width = self.frame_height = 32
         self._load_animations()
         self.state = "idle"
         self.direction = "front"
-        self.current_animation_key = "idle_front"
-        self.current_frame = 0
-        self.last_update = pygame.time.get_ticks()
-        self.animation_speed = 120
-        self.image = self.animations[self.current_animation_key][0]
+        self.animation_id = self.animations[(self.state, self.direction)]
+        self.animation_phase = animation_clock.start_phase(self.animation_id)
         self.rect = self.image.get_rect(topleft=(x, y))
         self.x, self.y = float(self.rect.x), float(self.rect.y)
+        self.prev_x, self.prev_y = self.x, self.y
         self.width, self.height = self.rect.size
         self.health = self.max_health = PLAYER_MAX_HEALTH
         self.speed = PLAYER_SPEED
+        self.velocity = (0.0, 0.0)
         self.health_items = 0
         self.ammo_items = 0
 
-    def _load_animations(self):
+    @classmethod
+    def _load_animations(cls):
+        # Uma tabela por tipo, indexada por (estado, direção) sem montar strings por frame
+        if cls.animations is not None:
+            return
+        spritesheet = SpriteSheet("assets/PlayerSheet.png")
         anim_map = {
             0: ("idle", "front", 5),
             1: ("idle", "back", 5),
@@ -47,43 +52,43 @@ class Player:
             6: ("walking", "right", 6),
             7: ("walking", "left", 6),
         }
+        cls.animations = {}
         for row, (state, direction, frame_count) in anim_map.items():
-            key = f"{state}_{direction}"
-            self.animations[key] = [
-                self.spritesheet.get_image(
-                    col * self.frame_width,
-                    row * self.frame_height,
-                    self.frame_width,
-                    self.frame_height,
-                )
-                for col in range(frame_count)
-            ]
+            cls.animations[(state, direction)] = animation_clock.register(
+                [
+                    spritesheet.get_image(
+                        col * cls.frame_width,
+                        row * cls.frame_height,
+                        cls.frame_width,
+                        cls.frame_height,
+                    )
+                    for col in range(frame_count)
+                ],
+                cls.animation_speed,
+            )
+
+    @property
+    def image(self):
+        return animation_clock.frame(self.animation_id, self.animation_phase)
 
     def _animate(self):
-        now = pygame.time.get_ticks()
-        anim_key = f"{self.state}_{self.direction}"
-        if anim_key != self.current_animation_key:
-            self.current_animation_key = anim_key
-            self.current_frame = 0
-        sequence = self.animations.get(anim_key)
-        if sequence and now - self.last_update > self.animation_speed:
-            self.last_update = now
-            self.current_frame = (self.current_frame + 1) % len(sequence)
-            center = self.rect.center
-            self.image = sequence[self.current_frame]
-            self.rect = self.image.get_rect(center=center)
+        # Troca de animação recomeça do frame 0; o resto é só o relógio global
+        animation_id = self.animations[(self.state, self.direction)]
+        if animation_id != self.animation_id:
+            self.animation_id = animation_id
+            self.animation_phase = animation_clock.start_phase(animation_id)
 
-    def update(self, dt, keys):
+    def update(self, dt, controls):
         if not self.is_alive:
             return
         dx = dy = 0
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        if controls.left:
             dx -= self.speed * dt
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        if controls.right:
             dx += self.speed * dt
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
+        if controls.up:
             dy -= self.speed * dt
-        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+        if controls.down:
             dy += self.speed * dt
         self.state = "idle" if dx == 0 and dy == 0 else "walking"
         if dx > 0:
@@ -94,6 +99,7 @@ class Player:
             self.direction = "front"
         elif dy < 0:
             self.direction = "back"
+        self.velocity = (dx / dt, dy / dt) if dt else (0.0, 0.0)
         new_x = self.x + dx
         new_y = self.y + dy
         wmin_x = 0
@@ -108,6 +114,15 @@ class Player:
         if self.health <= 0:
             self.is_alive = False
 
+    def save_position(self):
+        self.prev_x, self.prev_y = self.x, self.y
+
+    def render_position(self, alpha=1.0):
+        # Canto superior esquerdo interpolado entre o tick anterior e o atual
+        if alpha >= 1:
+            return self.rect.x, self.rect.y
+        return int(self.prev_x + (self.x - self.prev_x) * alpha), int(self.prev_y + (self.y - self.prev_y) * alpha)
+
     def take_damage(self, dmg):
         if self.is_alive:
             self.health = max(0, self.health - dmg)
@@ -119,30 +134,24 @@ class Player:
             return True
         return False
 
-    def use_ammo_item(self, npcs):
+    def use_ammo_item(self, world_grid):
         if not self.ammo_items:
             return 0
         self.ammo_items -= 1
-        hit = 0
-        for npc in npcs:
-            dist = math.hypot(
-                self.rect.centerx - npc.rect.centerx,
-                self.rect.centery - npc.rect.centery,
-            )
-            if dist <= AMMO_RADIUS:
-                npc.take_damage(AMMO_DAMAGE)
-                hit += 1
-        return hit
+        return world_grid.damage_npcs_in_radius(
+            self.rect.centerx, self.rect.centery, AMMO_RADIUS, AMMO_DAMAGE
+        )
 
-    def draw(self, surface, viewport):
+    def draw(self, surface, viewport, alpha=1.0):
         if not self.is_alive:
             return
-        sx, sy = viewport.world_to_screen(self.rect.x, self.rect.y)
-        surface.blit(self.image, (sx, sy))
+        sx, sy = viewport.world_to_screen(*self.render_position(alpha))
+        surface.blit(viewport.scale(self.image), (sx, sy))
         pct = self.health / self.max_health
-        bar_x, bar_y = sx, sy - 10
-        pygame.draw.rect(surface, RED, (bar_x, bar_y, self.rect.width, 5))
-        pygame.draw.rect(surface, GREEN, (bar_x, bar_y, self.rect.width * pct, 5))
+        zoom = viewport.zoom
+        bar_x, bar_y = sx, sy - 10 * zoom
+        pygame.draw.rect(surface, RED, (bar_x, bar_y, self.rect.width * zoom, 5 * zoom))
+        pygame.draw.rect(surface, GREEN, (bar_x, bar_y, self.rect.width * pct * zoom, 5 * zoom))
 
     def get_rect(self):
         return self.rect
\ No newline at end of file
@@ -0,0 +1,107 @@
+from collections import OrderedDict
+
+import pygame
+
+from settings import (
+    BLACK,
+    WHITE,
+    GREEN,
+    YELLOW,
+    GRAY,
+    GRID_SIZE,
+    HUD_TEXT_CACHE_SIZE,
+    MINIMAP_CELL_STRIDE,
+    MINIMAP_MAX_SIZE,
+)
+
+
+class TextCache:
+    # font.render só roda para textos ainda não vistos; os menos usados saem (LRU)
+    def __init__(self, font, max_entries=HUD_TEXT_CACHE_SIZE):
+        self.font = font
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.renders = 0
+
+    def render(self, text, color=WHITE):
+        key = (text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = self.surfaces[key] = self.font.render(text, True, color)
+        self.renders += 1
+        while len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+
+class Hud:
+    def __init__(self, font):
+        self.text = TextCache(font)
+        self.line_height = 30
+
+    def draw(self, screen, remaining_time, health, max_health, ammo):
+        texts = (
+            f"Tempo: {remaining_time:.1f}s",
+            f"Vida: {health}/{max_health}",
+            f"Munição: {ammo}",
+        )
+        screen.blits(
+            [(self.text.render(text), (10, 10 + i * self.line_height)) for i, text in enumerate(texts)],
+            doreturn=False,
+        )
+
+
+class Minimap:
+    # O mapa fica numa Surface própria; por frame só as células que mudaram de cor
+    # (área do jogador e áreas ativas) são repintadas, o resto é um blit só.
+    def __init__(self, grid_size=GRID_SIZE, max_size=MINIMAP_MAX_SIZE):
+        self.grid_size = grid_size
+        stride = max(1, min(MINIMAP_CELL_STRIDE, max_size // grid_size))
+        self.padding = stride // 6
+        self.cell_size = stride - self.padding
+        self.stride = stride
+        self.border_size = 2
+        size = grid_size * stride - self.padding + self.border_size * 2
+        self.surface = pygame.Surface((size, size))
+        self.colors = {}
+        self.repaints = 0
+        self._paint_base()
+
+    def _paint_base(self):
+        self.surface.fill(BLACK)
+        pygame.draw.rect(self.surface, WHITE, self.surface.get_rect(), 1)
+        if self.padding:
+            for gx in range(self.grid_size):
+                for gy in range(self.grid_size):
+                    self.surface.fill(GRAY, self._cell_rect((gx, gy)))
+        else:
+            border = self.border_size
+            self.surface.fill(GRAY, self.surface.get_rect().inflate(-border * 2, -border * 2))
+        self.colors = {}
+
+    def _cell_rect(self, coord):
+        return (
+            self.border_size + coord[0] * self.stride,
+            self.border_size + coord[1] * self.stride,
+            self.cell_size,
+            self.cell_size,
+        )
+
+    def update(self, player_coord, active_areas):
+        colors = {coord: GREEN for coord in active_areas}
+        colors[player_coord] = YELLOW
+        if colors == self.colors:
+            return
+        for coord in self.colors.keys() - colors.keys():
+            self.surface.fill(GRAY, self._cell_rect(coord))
+            self.repaints += 1
+        for coord, color in colors.items():
+            if self.colors.get(coord) != color:
+                self.surface.fill(color, self._cell_rect(coord))
+                self.repaints += 1
+        self.colors = colors
+
+    def draw(self, screen):
+        screen.blit(self.surface, (screen.get_width() - self.surface.get_width() - 8, 8))
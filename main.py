@@ -1,31 +1,51 @@
+import argparse
+import json
 import pygame
 import sys
-import time
 
+from atlas import TextureAtlas
+from background import BackgroundLayer
+from checkpoint import Checkpointer, load_checkpoint
 from camera import Viewport
-from entities.Player import Player
+from compositor import Compositor
+from effects import ParticlePool
+from entities.AnimationClock import animation_clock
+from hud import Hud, Minimap
 from settings import (
     SCREEN_WIDTH,
     SCREEN_HEIGHT,
-    AREA_WIDTH,
-    AREA_HEIGHT,
-    GAME_DURATION,
     FPS,
+    TICK_RATE,
+    MAX_CATCHUP_TICKS,
     BLACK,
     WHITE,
     GREEN,
     RED,
-    YELLOW,
-    AMMO_RADIUS,
-    GRAY,
-    GRID_SIZE,
-    HEALTH_RESTORE,
+    BACKGROUND_PARALLAX,
+    ZOOM_LEVELS,
+    DEFAULT_ZOOM,
+    SIM_WORKERS,
+    GENERATION_CACHE_DIR,
+    CHECKPOINT_INTERVAL,
 )
-from world.WorldGrid import WorldGrid
+from profiler import profiler
+from replay import InputLog, InputRecorder, final_state, session_path
+from simulation import InputState, Simulation
+from sprites import asset_registry
 
 
 class Game:
-    def __init__(self):
+    def __init__(
+        self,
+        profile=False,
+        profile_out=None,
+        direct_render=False,
+        workers=SIM_WORKERS,
+        record=None,
+        replay=None,
+        tick_rate=TICK_RATE,
+        uncapped=False,
+    ):
         pygame.init()
         self.screen_width = SCREEN_WIDTH
         self.screen_height = SCREEN_HEIGHT
@@ -33,30 +53,98 @@ class Game:
             (self.screen_width, self.screen_height), pygame.RESIZABLE
         )
         pygame.display.set_caption("RogueLike 9 Areas")
-        self.zoom_level = 2.0
-        self.game_surface_size = (
-            int(self.screen_width / self.zoom_level),
-            int(self.screen_height / self.zoom_level),
-        )
-        self.game_surface = pygame.Surface(self.game_surface_size)
+        # Atlas montado com `python atlas.py`; sem ele (ou desatualizado) os PNGs são lidos um a um
+        asset_registry.use_atlas(TextureAtlas.load())
+        self.zoom_level = DEFAULT_ZOOM
+        self.workers = workers
+        self.compositor = Compositor(self.screen_width, self.screen_height, self.zoom_level, direct_render)
         self.clock = pygame.time.Clock()
         self.title_font = pygame.font.Font(None, 74)
         self.instructions_font = pygame.font.Font(None, 36)
+        self.hud = Hud(self.instructions_font)
+        self.minimap = Minimap()
         self.running = True
-        self.ammo_effect = None
+        self.effects = ParticlePool()
+        self.checkpointer = Checkpointer()
+        self.next_checkpoint = CHECKPOINT_INTERVAL
+        self.pending_actions = 0
         self.game_state = "start_screen"
+        self.tick_dt = 1.0 / tick_rate
+        self.uncapped = uncapped
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.ticks = 0
+        self.late_ticks = 0
+        self.dropped_ticks = 0
+        self.record_path = record
+        self.recorder = None
+        self.record_sessions = 0
+        self.replay_log = InputLog.load(replay) if replay else None
+        self.replay_inputs = None
+        self.profile_out = profile_out
+        self.show_profiler = profile
+        profiler.set_enabled(profile or profile_out is not None)
+        profiler.recording = profile_out is not None
+        self.profiler_font = pygame.font.Font(None, 20)
         try:
-            self.background_tile = pygame.image.load("assets/space.png").convert()
-            self.bg_tile_size = self.background_tile.get_size()
+            background_tile = asset_registry.get_sheet("assets/space.png", alpha=False)
+            self.background = BackgroundLayer(background_tile, BACKGROUND_PARALLAX)
+            self.background.resize(self.screen_width, self.screen_height)
         except:
-            self.background_tile = None
+            self.background = None
+
+    def reset_game(self, seed=None):
+        self.viewport = Viewport(*self.compositor.world_size, self.compositor.view_zoom)
+        if hasattr(self, "simulation"):
+            self.simulation.close()
+        if self.replay_log:
+            seed = self.replay_log.seed
+            self.replay_inputs = iter(self.replay_log)
+        # Gravação e replay carregam as áreas no próprio tick: com streaming o momento
+        # em que uma área fica pronta depende das threads e a sessão não se repete
+        deterministic = self.record_path is not None or self.replay_log is not None
+        self.simulation = Simulation(
+            seed, streaming=not deterministic, workers=self.workers, cache_dir=GENERATION_CACHE_DIR
+        )
+        if self.record_path:
+            if self.recorder:
+                self.recorder.close()
+            # Cada partida num arquivo próprio: reiniciar não apaga o log da anterior
+            self.record_sessions += 1
+            self.recorder = InputRecorder(session_path(self.record_path, self.record_sessions), self.simulation.seed)
+        self.checkpointer.reset()
+        self._start_session()
+
+    def load_game(self):
+        # F9: volta ao último checkpoint (fora de gravação e replay, que precisam da sessão inteira)
+        if self.recorder or self.replay_log:
+            return
+        self.checkpointer.wait()
+        try:
+            simulation = load_checkpoint(
+                self.checkpointer.directory, streaming=True, workers=self.workers, cache_dir=GENERATION_CACHE_DIR
+            )
+        except (OSError, ValueError):
+            return
+        self.simulation.close()
+        self.simulation = simulation
+        self.checkpointer.reset(simulation.checkpoint_areas)
+        self._start_session()
+        self._sync_viewport()
 
-    def reset_game(self):
-        self.game_start_time = time.time()
-        self.viewport = Viewport(self.game_surface_size[0], self.game_surface_size[1])
-        self.world_grid = WorldGrid()
-        self.player = Player(AREA_WIDTH // 2, AREA_HEIGHT // 2)
-        self.game_state = "playing"
+    def save_game(self):
+        if self.checkpointer.save(self.simulation):
+            self.next_checkpoint = self.simulation.elapsed + CHECKPOINT_INTERVAL
+
+    def _start_session(self):
+        self.world_grid = self.simulation.world_grid
+        self.player = self.simulation.player
+        self.effects.clear()
+        self.pending_actions = 0
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.next_checkpoint = self.simulation.elapsed + CHECKPOINT_INTERVAL
+        self.game_state = self.simulation.state
 
     def handle_gameplay_events(self):
         for event in pygame.event.get():
@@ -67,14 +155,20 @@ class Game:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
+                elif event.key == pygame.K_F3:
+                    self.toggle_profiler()
+                elif event.key == pygame.K_F5:
+                    self.save_game()
+                elif event.key == pygame.K_F9:
+                    self.load_game()
+                elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                    self.change_zoom(1)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    self.change_zoom(-1)
                 elif event.key == pygame.K_h:
-                    self.player.use_health_item()
+                    self.pending_actions |= InputState.USE_HEALTH
                 elif event.key == pygame.K_SPACE:
-                    npcs, _ = self.world_grid.get_active_entities()
-                    if self.player.use_ammo_item(npcs):
-                        player_center_x = self.player.rect.centerx
-                        player_center_y = self.player.rect.centery
-                        self.ammo_effect = {"pos": (player_center_x, player_center_y), "timer": 0.2}
+                    self.pending_actions |= InputState.USE_AMMO
 
     def handle_menu_events(self):
         for event in pygame.event.get():
@@ -90,100 +184,133 @@ class Game:
                 if self.game_state in ["game_over", "win_screen"] and event.key == pygame.K_r:
                     self.reset_game()
 
+    def toggle_profiler(self):
+        self.show_profiler = not self.show_profiler
+        if self.profile_out is None:
+            profiler.set_enabled(self.show_profiler)
+
+    def change_zoom(self, step):
+        levels = sorted(set(ZOOM_LEVELS) | {self.zoom_level})
+        index = min(len(levels) - 1, max(0, levels.index(self.zoom_level) + step))
+        self.set_zoom(levels[index])
+
+    def set_zoom(self, zoom):
+        self.zoom_level = zoom
+        self.compositor.set_zoom(zoom)
+        self._sync_viewport()
+
+    def _sync_viewport(self):
+        if hasattr(self, "viewport"):
+            self.viewport.update_size(*self.compositor.world_size)
+            self.viewport.set_zoom(self.compositor.view_zoom)
+            self.viewport.update(self.player.rect.centerx, self.player.rect.centery)
+
     def handle_resize(self, event):
         self.screen_width = event.w
         self.screen_height = event.h
         self.screen = pygame.display.set_mode(
             (self.screen_width, self.screen_height), pygame.RESIZABLE
         )
-        self.game_surface_size = (
-            int(self.screen_width / self.zoom_level),
-            int(self.screen_height / self.zoom_level),
-        )
-        self.game_surface = pygame.Surface(self.game_surface_size)
-        if hasattr(self, "viewport"):
-            self.viewport.update_size(self.game_surface_size[0], self.game_surface_size[1])
+        self.compositor.resize(self.screen_width, self.screen_height)
+        if self.background:
+            self.background.resize(self.screen_width, self.screen_height)
+        self._sync_viewport()
 
     def update(self, dt):
         if self.game_state != "playing":
             return
-        if self.ammo_effect:
-            self.ammo_effect["timer"] -= dt
-            if self.ammo_effect["timer"] <= 0:
-                self.ammo_effect = None
-        if not self.player.is_alive:
-            self.game_state = "game_over"
-            return
-        if time.time() - self.game_start_time >= GAME_DURATION:
-            self.game_state = "win_screen"
-            return
-        keys = pygame.key.get_pressed()
-        self.player.update(dt, keys)
-        self.viewport.update(self.player.rect.centerx, self.player.rect.centery)
-        self.world_grid.update_active_areas(self.player.x, self.player.y)
-        self.world_grid.update(dt, self.player)
-        self.check_collisions()
+        if self.replay_inputs is not None:
+            recorded = next(self.replay_inputs, None)
+            if recorded is None:
+                self.finish_replay()
+                return
+            dt, buttons, view = recorded
+            inputs = InputState(buttons)
+        else:
+            inputs = InputState.from_keys(pygame.key.get_pressed(), self.pending_actions)
+            # O que a câmera mostra anda todo tick (nível 0 do LOD); entra no log junto com as entradas
+            view = (self.viewport.width, self.viewport.height)
+            if self.recorder:
+                self.recorder.write(dt, inputs.buttons, view)
+        self.simulation.set_view(*view)
+        self.pending_actions = 0
+        for event, data in self.simulation.step(dt, inputs):
+            if event == "ammo":
+                self.effects.blast(*data)
+            elif event == "hit":
+                self.effects.hit(*data)
+            elif event == "pickup":
+                self.effects.pickup(*data)
+        self.effects.update(dt)
+        self.game_state = self.simulation.state
+        if self.replay_inputs is None and self.simulation.elapsed >= self.next_checkpoint:
+            self.save_game()
+        if self.replay_inputs is not None and self.game_state != "playing":
+            self.finish_replay()
 
-    def check_collisions(self):
-        if not self.player.is_alive:
+    def advance(self, frame_dt):
+        # Passo fixo: o tempo real entra no acumulador e a simulação anda em ticks de
+        # tick_dt. Sob sobrecarga roda no máximo MAX_CATCHUP_TICKS por frame e descarta o
+        # resto do atraso. No replay o dt vem do log: um tick por frame.
+        if self.replay_inputs is not None:
+            self.update(self.tick_dt)
+            self.ticks += 1
+            self.alpha = 1.0
             return
-        npcs, items = self.world_grid.get_active_entities()
-        player_rect = self.player.get_rect()
-        for npc in npcs:
-            if npc.is_alive:
-                npc.attack_player(self.player)
-        for item in items:
-            if not item.collected and player_rect.colliderect(item.get_rect()):
-                item.collected = True
-                if item.item_type == "health":
-                    self.player.health = min(self.player.max_health, self.player.health + HEALTH_RESTORE)
-                elif item.item_type == "ammo":
-                    self.player.ammo_items += 1
+        self.accumulator += frame_dt
+        steps = 0
+        while self.accumulator >= self.tick_dt and steps < MAX_CATCHUP_TICKS and self.game_state == "playing":
+            self.update(self.tick_dt)
+            self.accumulator -= self.tick_dt
+            steps += 1
+        self.ticks += steps
+        self.late_ticks += max(0, steps - 1)
+        if self.accumulator >= self.tick_dt:
+            dropped = int(self.accumulator // self.tick_dt)
+            self.dropped_ticks += dropped
+            self.accumulator -= dropped * self.tick_dt
+        self.alpha = min(1.0, self.accumulator / self.tick_dt)
+
+    def finish_replay(self):
+        print(json.dumps(final_state(self.simulation)))
+        self.running = False
 
     def draw_background(self):
-        if not self.background_tile:
+        if not self.background:
             self.screen.fill(BLACK)
             return
-        if not hasattr(self, "viewport"):
-            return
-        offset_x = self.viewport.x % self.bg_tile_size[0]
-        offset_y = self.viewport.y % self.bg_tile_size[1]
-        for x in range(-self.bg_tile_size[0], self.screen_width, self.bg_tile_size[0]):
-            for y in range(-self.bg_tile_size[1], self.screen_height, self.bg_tile_size[1]):
-                self.screen.blit(self.background_tile, (x - offset_x, y - offset_y))
+        if hasattr(self, "viewport"):
+            self.background.draw(self.screen, self.viewport.x, self.viewport.y)
+        else:
+            self.background.draw(self.screen)
 
     def draw_gameplay(self):
-        self.draw_background()
-        self.game_surface.set_colorkey(BLACK)
-        self.game_surface.fill(BLACK)
-        self.world_grid.draw(self.game_surface, self.viewport)
-        self.player.draw(self.game_surface, self.viewport)
-        self.draw_ammo_effect(on_surface=self.game_surface)
-        scaled_surface = pygame.transform.scale(self.game_surface, (self.screen_width, self.screen_height))
-        self.screen.blit(scaled_surface, (0, 0))
-        self.draw_ui()
-        self.draw_minimap()
-
-    def draw_ammo_effect(self, on_surface):
-        if self.ammo_effect:
-            effect_pos_world = self.ammo_effect["pos"]
-            effect_pos_screen = self.viewport.world_to_screen(effect_pos_world[0], effect_pos_world[1])
-            surface = pygame.Surface((AMMO_RADIUS * 2, AMMO_RADIUS * 2), pygame.SRCALPHA)
-            alpha = int(150 * (self.ammo_effect["timer"] / 0.2))
-            pygame.draw.circle(surface, (*YELLOW, alpha), (AMMO_RADIUS, AMMO_RADIUS), AMMO_RADIUS)
-            on_surface.blit(surface, (effect_pos_screen[0] - AMMO_RADIUS, effect_pos_screen[1] - AMMO_RADIUS))
+        # A câmera segue a posição interpolada do jogador
+        player_x, player_y = self.player.render_position(self.alpha)
+        self.viewport.update(player_x + self.player.rect.width // 2, player_y + self.player.rect.height // 2)
+        with profiler.scope("draw_background"):
+            self.draw_background()
+        target = self.compositor.begin(self.screen)
+        with profiler.scope("world.draw"):
+            self.world_grid.draw(target, self.viewport, self.alpha)
+        self.player.draw(target, self.viewport, self.alpha)
+        with profiler.scope("effects"):
+            self.effects.draw(target, self.viewport)
+        with profiler.scope("scale"):
+            self.compositor.present(self.screen)
+        with profiler.scope("draw_ui"):
+            self.draw_ui()
+        with profiler.scope("draw_minimap"):
+            self.draw_minimap()
 
     def draw_ui(self):
-        elapsed_time = time.time() - self.game_start_time
-        remaining_time = max(0, GAME_DURATION - elapsed_time)
-        texts = [
-            f"Tempo: {remaining_time:.1f}s",
-            f"Vida: {self.player.health}/{self.player.max_health}",
-            f"Munição: {self.player.ammo_items}",
-        ]
-        for i, text in enumerate(texts):
-            surface = self.instructions_font.render(text, True, WHITE)
-            self.screen.blit(surface, (10, 10 + i * 30))
+        self.hud.draw(
+            self.screen,
+            self.simulation.remaining_time,
+            self.player.health,
+            self.player.max_health,
+            self.player.ammo_items,
+        )
 
     def draw_start_screen(self):
         self.draw_background()
@@ -206,51 +333,88 @@ class Game:
         self.screen.blit(title_surf, title_rect)
         self.screen.blit(inst_surf, inst_rect)
 
+    def tick_report(self):
+        return f"ticks {self.ticks}  atrasados {self.late_ticks}  descartados {self.dropped_ticks}"
+
+    def draw_profiler_overlay(self):
+        if not self.show_profiler or not profiler.enabled:
+            return
+        lines = ["etapa                         p50    p95    p99 (ms)"]
+        lines += [f"{name:<26} {p50:6.2f} {p95:6.2f} {p99:6.2f}" for name, p50, p95, p99 in profiler.summary()]
+        lines.append(self.tick_report())
+        line_height = self.profiler_font.get_linesize()
+        overlay = pygame.Surface((340, line_height * len(lines) + 8), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            overlay.blit(self.profiler_font.render(line, True, WHITE), (4, 4 + i * line_height))
+        self.screen.blit(overlay, (10, self.screen_height - overlay.get_height() - 10))
+
     def run(self):
+        if self.replay_log:
+            self.reset_game()
         while self.running:
-            dt = self.clock.tick(FPS) / 1000.0
+            # Replay e --uncapped desenham sem limite de FPS; a simulação segue em passo fixo
+            dt = (self.clock.tick() if self.replay_log or self.uncapped else self.clock.tick(FPS)) / 1000.0
+            profiler.begin_frame()
+            animation_clock.advance(dt)
             if self.game_state == "start_screen":
                 self.handle_menu_events()
                 self.draw_start_screen()
             elif self.game_state == "playing":
-                self.handle_gameplay_events()
-                self.update(dt)
-                self.draw_gameplay()
+                with profiler.scope("events"):
+                    self.handle_gameplay_events()
+                with profiler.scope("update"):
+                    self.advance(dt)
+                with profiler.scope("draw"):
+                    self.draw_gameplay()
+                with profiler.scope("profiler_overlay"):
+                    self.draw_profiler_overlay()
             elif self.game_state == "game_over":
                 self.handle_menu_events()
                 self.draw_end_screen("GAME OVER", RED, "Pressione R para reiniciar ou ESC para sair")
             elif self.game_state == "win_screen":
                 self.handle_menu_events()
                 self.draw_end_screen("VOCÊ VENCEU!", GREEN, "Pressione R para reiniciar ou ESC para sair")
-            pygame.display.flip()
+            with profiler.scope("flip"):
+                pygame.display.flip()
+            profiler.end_frame()
+        if self.profile_out:
+            profiler.export(self.profile_out)
+        if self.uncapped or self.profile_out:
+            print(self.tick_report())
+        if self.recorder:
+            self.recorder.close()
+        self.checkpointer.close()
+        if hasattr(self, "simulation"):
+            self.simulation.close()
         pygame.quit()
         sys.exit()
 
     def draw_minimap(self):
         if not hasattr(self, "player"):
             return
-        cell_size, padding, border_size = 20, 4, 2
-        total_width = (GRID_SIZE * cell_size) + ((GRID_SIZE - 1) * padding)
-        total_height = (GRID_SIZE * cell_size) + ((GRID_SIZE - 1) * padding)
-        map_x = self.screen_width - total_width - 10
-        map_y = 10
-        background_rect = pygame.Rect(map_x - border_size, map_y - border_size, total_width + (border_size * 2), total_height + (border_size * 2))
-        pygame.draw.rect(self.screen, BLACK, background_rect)
-        pygame.draw.rect(self.screen, WHITE, background_rect, 1)
-        player_grid_x = int(self.player.x // AREA_WIDTH)
-        player_grid_y = int(self.player.y // AREA_HEIGHT)
-        player_area_coord = (player_grid_x, player_grid_y)
-        for gx in range(GRID_SIZE):
-            for gy in range(GRID_SIZE):
-                coord, color = (gx, gy), GRAY
-                if coord == player_area_coord:
-                    color = YELLOW
-                elif coord in self.world_grid.active_areas:
-                    color = GREEN
-                rect_x = map_x + gx * (cell_size + padding)
-                rect_y = map_y + gy * (cell_size + padding)
-                pygame.draw.rect(self.screen, color, (rect_x, rect_y, cell_size, cell_size))
+        self.minimap.update(self.world_grid.coord_at(self.player.x, self.player.y), self.world_grid.active_areas)
+        self.minimap.draw(self.screen)
 
 if __name__ == "__main__":
-    game = Game()
+    parser = argparse.ArgumentParser(description="RogueLike 9 Areas")
+    parser.add_argument("--profile", action="store_true", help="liga o profiler e o overlay (F3 alterna)")
+    parser.add_argument("--profile-out", metavar="ARQUIVO", help="grava os tempos de cada frame em .csv ou .json")
+    parser.add_argument("--direct-render", action="store_true", help="desenha o mundo direto na tela com sprites pré-escalados")
+    parser.add_argument("--workers", type=int, default=SIM_WORKERS, help="processos para simular os NPCs (0 = serial)")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="ticks de simulação por segundo")
+    parser.add_argument("--uncapped", action="store_true", help="desenha sem limite de FPS (a simulação segue em passo fixo)")
+    parser.add_argument("--record", metavar="ARQUIVO", help="grava seed, dt e entradas de cada tick para replay")
+    parser.add_argument("--replay", metavar="ARQUIVO", help="reexecuta um log gravado, sem limite de FPS")
+    args = parser.parse_args()
+    game = Game(
+        profile=args.profile,
+        profile_out=args.profile_out,
+        direct_render=args.direct_render,
+        workers=args.workers,
+        record=args.record,
+        replay=args.replay,
+        tick_rate=args.tick_rate,
+        uncapped=args.uncapped,
+    )
     game.run()
@@ -0,0 +1,131 @@
+import csv
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+from settings import PROFILER_HISTORY
+
+
+class _NullScope:
+    # Escopo usado com o profiler desligado: não mede nada
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start", "stack")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        # Guarda a pilha usada: set_enabled pode trocá-la enquanto o escopo está aberto
+        self.stack = self.profiler.stack
+        self.stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1000.0
+        stack = self.stack
+        path = "/".join(stack)
+        stack.pop()
+        if stack is not self.profiler.stack:
+            # Profiler religado ou desligado no meio do escopo: a medida não vale para o frame novo
+            return False
+        current = self.profiler.current
+        current[path] = current.get(path, 0.0) + elapsed
+        return False
+
+
+class FrameProfiler:
+    # Tempos por etapa do frame em ms. Escopos aninhados viram caminhos "pai/filho".
+    def __init__(self, history=PROFILER_HISTORY):
+        self.enabled = False
+        self.recording = False
+        self.history = history
+        self.samples = {}
+        self.current = {}
+        self.stack = []
+        self.frames = []
+        self.frame_index = 0
+        self.frame_start = None
+
+    def scope(self, name):
+        if not self.enabled:
+            return NULL_SCOPE
+        return _Scope(self, name)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.current = {}
+        self.stack = []
+        self.frame_start = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or self.frame_start is None:
+            return
+        self.current["total"] = (time.perf_counter() - self.frame_start) * 1000.0
+        for name, elapsed in self.current.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.history)
+            samples.append(elapsed)
+        if self.recording:
+            self.frames.append((self.frame_index, self.current))
+        self.frame_index += 1
+        self.frame_start = None
+
+    def percentiles(self, name):
+        samples = self.samples.get(name)
+        if not samples:
+            return 0.0, 0.0, 0.0
+        p50, p95, p99 = np.percentile(np.fromiter(samples, dtype=np.float64), (50, 95, 99))
+        return float(p50), float(p95), float(p99)
+
+    def summary(self):
+        rows = [(name, *self.percentiles(name)) for name in self.samples]
+        rows.sort(key=lambda row: row[0])
+        return rows
+
+    def reset(self):
+        self.samples = {}
+        self.frames = []
+        self.frame_index = 0
+
+    def export(self, path):
+        stages = sorted({name for _, timings in self.frames for name in timings})
+        if path.endswith(".json"):
+            data = {
+                "stages": stages,
+                "summary": {name: dict(zip(("p50", "p95", "p99"), p)) for name, *p in self.summary()},
+                "frames": [{"frame": index, **timings} for index, timings in self.frames],
+            }
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1)
+            return
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + stages)
+            for index, timings in self.frames:
+                writer.writerow([index] + [f"{timings.get(name, 0.0):.4f}" for name in stages])
+
+
+profiler = FrameProfiler()
@@ -0,0 +1,40 @@
+import pygame
+
+from settings import RED, GREEN
+
+
+class RenderQueue:
+    # Coleta (surface, destino) já culados e escalados e envia cada camada num único
+    # Surface.blits. Ordem: chão de todas as áreas, itens, NPCs e por fim as barras.
+    # Barras de vida também são sprites: uma Surface por (largura, altura, parte verde),
+    # desenhada uma vez e reaproveitada entre frames.
+    def __init__(self):
+        self.ground = []
+        self.items = []
+        self.npcs = []
+        self.bars = []
+        self.bar_images = {}
+
+    def clear(self):
+        self.ground.clear()
+        self.items.clear()
+        self.npcs.clear()
+        self.bars.clear()
+
+    def add_health_bar(self, x, y, width, height, pct):
+        key = (int(width), int(height), int(width * pct))
+        image = self.bar_images.get(key)
+        if image is None:
+            image = self.bar_images[key] = pygame.Surface(key[:2])
+            image.fill(RED)
+            image.fill(GREEN, (0, 0, key[2], key[1]))
+        self.bars.append((image, (int(x), int(y))))
+
+    def __len__(self):
+        return len(self.ground) + len(self.items) + len(self.npcs) + len(self.bars)
+
+    def flush(self, surface):
+        for layer in (self.ground, self.items, self.npcs, self.bars):
+            if layer:
+                surface.blits(layer, doreturn=False)
+        self.clear()
@@ -0,0 +1,151 @@
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+
+from settings import LOD_VIEW_SIZE
+from simulation import InputState, Simulation
+
+# Cabeçalho: assinatura, versão e seed. Depois, registros (dt, botões, repetições):
+# ticks seguidos com o mesmo dt e os mesmos botões viram um registro só. Com botões
+# VIEW o registro muda a região da câmera (dt = largura, repetições = altura), que
+# decide o nível de detalhe da simulação.
+MAGIC = b"RLRP"
+VERSION = 2
+HEADER = struct.Struct("<4sBQ")
+RECORD = struct.Struct("<dBH")
+MAX_REPEAT = 0xFFFF
+VIEW = 0xFF
+
+
+def session_path(path, session):
+    # Primeira sessão no caminho pedido; as seguintes (R para reiniciar) em "nome.2.rlog", ...
+    if session <= 1:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{session}{ext}"
+
+
+class InputRecorder:
+    def __init__(self, path, seed):
+        self.path = path
+        self.seed = seed
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed))
+        self.pending = None
+        self.view = LOD_VIEW_SIZE
+        self.ticks = 0
+
+    def write(self, dt, buttons, view=LOD_VIEW_SIZE):
+        self.ticks += 1
+        if view != self.view:
+            self._flush()
+            self.file.write(RECORD.pack(view[0], VIEW, view[1]))
+            self.view = view
+        if self.pending is not None:
+            pending_dt, pending_buttons, repeat = self.pending
+            if pending_dt == dt and pending_buttons == buttons and repeat < MAX_REPEAT:
+                self.pending = (dt, buttons, repeat + 1)
+                return
+            self.file.write(RECORD.pack(*self.pending))
+        self.pending = (dt, buttons, 1)
+
+    def _flush(self):
+        if self.pending is not None:
+            self.file.write(RECORD.pack(*self.pending))
+            self.pending = None
+
+    def close(self):
+        if self.file.closed:
+            return
+        self._flush()
+        self.file.close()
+
+
+class InputLog:
+    def __init__(self, seed, records):
+        self.seed = seed
+        self.records = records
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, seed = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} não é um log de replay (versão {VERSION})")
+        body = data[HEADER.size:]
+        return cls(seed, [record for record in RECORD.iter_unpack(body[: len(body) - len(body) % RECORD.size])])
+
+    @property
+    def ticks(self):
+        return sum(repeat for _, buttons, repeat in self.records if buttons != VIEW)
+
+    def __iter__(self):
+        # (dt, botões, região da câmera) de cada tick
+        view = LOD_VIEW_SIZE
+        for dt, buttons, repeat in self.records:
+            if buttons == VIEW:
+                view = (int(dt), repeat)
+                continue
+            for _ in range(repeat):
+                yield dt, buttons, view
+
+
+def final_state(simulation):
+    # Resumo comparável entre execuções: mesmo log + mesmo código = mesmo resumo
+    player = simulation.player
+    engine = simulation.world_grid.npc_engine
+    count = engine.count
+    digest = hashlib.sha1()
+    for array in (engine.pos[:count], engine.health[:count], engine.alive[:count]):
+        digest.update(array.tobytes())
+    return {
+        "state": simulation.state,
+        "ticks": simulation.tick_count,
+        "elapsed": round(simulation.elapsed, 6),
+        "player": [player.x, player.y, player.health, player.ammo_items, player.health_items],
+        "npcs_alive": int(engine.alive[:count].sum()),
+        "active_areas": sorted(list(coord) for coord in simulation.world_grid.active_areas),
+        "npc_digest": digest.hexdigest(),
+    }
+
+
+def replay(log, workers=0):
+    simulation = Simulation(log.seed, workers=workers)
+    start = time.perf_counter()
+    for dt, buttons, view in log:
+        simulation.set_view(*view)
+        simulation.step(dt, InputState(buttons))
+    elapsed = time.perf_counter() - start
+    simulation.close()
+    return simulation, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reexecuta um log gravado com main.py --record, sem janela")
+    parser.add_argument("log")
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--out", metavar="ARQUIVO", help="grava o estado final em JSON")
+    parser.add_argument("--diff", metavar="ARQUIVO", help="compara o estado final com um JSON gravado antes")
+    args = parser.parse_args()
+    log = InputLog.load(args.log)
+    simulation, elapsed = replay(log, args.workers)
+    state = final_state(simulation)
+    ticks = max(1, simulation.tick_count)
+    print(f"seed {log.seed}: {simulation.tick_count} ticks em {elapsed:.2f}s ({elapsed / ticks * 1000:.3f} ms/tick)")
+    print(json.dumps(state))
+    if args.out:
+        with open(args.out, "w") as file:
+            json.dump(state, file, indent=2)
+    if args.diff:
+        with open(args.diff) as file:
+            expected = json.load(file)
+        changed = {key: (expected.get(key), value) for key, value in state.items() if expected.get(key) != value}
+        for key, (before, after) in changed.items():
+            print(f"  {key}: {before} -> {after}")
+        print("estado final idêntico" if not changed else "estado final DIFERENTE")
+        sys.exit(1 if changed else 0)
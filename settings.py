@@ -1,11 +1,19 @@
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 768
 FPS = 60
+# Simulação em passo fixo, independente do FPS de desenho
+TICK_RATE = 60
+MAX_CATCHUP_TICKS = 5
+PARTICLE_POOL_SIZE = 4096
+EFFECT_ALPHA_STEPS = 16
+CHECKPOINT_DIR = "saves"
+CHECKPOINT_INTERVAL = 10.0
 GAME_DURATION = 300
 GRID_SIZE = 3
 AREA_WIDTH = 800
 AREA_HEIGHT = 600
 AREA_ACTIVATION_DISTANCE = 500
+ACTIVATION_HYSTERESIS = 32
 MAX_ACTIVE_AREAS = 4
 PLAYER_SIZE = 32
 PLAYER_SPEED = 200
@@ -18,6 +26,39 @@ ITEM_SIZE = 16
 HEALTH_RESTORE = 25
 AMMO_DAMAGE = 30
 AMMO_RADIUS = 64
+SPATIAL_CELL_SIZE = max(AMMO_RADIUS, NPC_SIZE * 2)
+FLOW_TILE_SIZE = 16
+ASSET_CACHE_MAX_BYTES = 64 * 1024 * 1024
+GROUND_CHUNK_SIZE = 256
+BACKGROUND_PARALLAX = 1.0
+BACKGROUND_DIRECT_MAX_BLITS = 16
+BACKGROUND_RESIZE_DELAY = 0.25
+ZOOM_LEVELS = (1.0, 1.5, 2.0, 3.0)
+DEFAULT_ZOOM = 2.0
+COMPOSITOR_BUFFER_CACHE = 6
+HUD_TEXT_CACHE_SIZE = 64
+MINIMAP_CELL_STRIDE = 24
+MINIMAP_MAX_SIZE = 220
+ENTITY_POOL_MAX = 4096
+PROFILER_HISTORY = 300
+STREAMING_WORKERS = 1
+STREAMING_BUILDS_PER_FRAME = 1
+PREFETCH_SECONDS = 1.5
+# Nível 0 do LOD: a região do mundo que a câmera mostra (a do zoom padrão até o jogo
+# informar a real) mais uma margem para o atraso da interpolação
+LOD_VIEW_SIZE = (int(SCREEN_WIDTH / DEFAULT_ZOOM), int(SCREEN_HEIGHT / DEFAULT_ZOOM))
+LOD_VIEW_MARGIN = 64
+LOD_NEAR_INTERVAL = 0.1
+LOD_FAR_INTERVAL = 1.0
+LOD_MAX_STEP = 0.25
+LOD_NPC_BUDGET = 2000
+LOD_LOAD_DISTANCE = AREA_ACTIVATION_DISTANCE * 3
+SIM_WORKERS = 0
+PARALLEL_MIN_NPCS = 512
+AREA_CACHE_MAX_BYTES = 8 * 1024 * 1024
+GENERATION_CACHE_DIR = "cache"
+GENERATION_CACHE_FILES = 8
+ATLAS_PATH = "assets/atlas"
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 RED = (255, 0, 0)
@@ -0,0 +1,127 @@
+import random
+
+import pygame
+
+from entities.Player import Player
+from profiler import profiler
+from settings import (
+    AREA_WIDTH,
+    AREA_HEIGHT,
+    GAME_DURATION,
+    HEALTH_RESTORE,
+    SIM_WORKERS,
+)
+from world.WorldGrid import WorldGrid
+
+
+class InputState:
+    # Entrada de um tick como bitmask: direções seguradas + ações discretas (H e ESPAÇO)
+    LEFT = 1
+    RIGHT = 2
+    UP = 4
+    DOWN = 8
+    USE_HEALTH = 16
+    USE_AMMO = 32
+
+    def __init__(self, buttons=0):
+        self.buttons = buttons
+
+    @classmethod
+    def from_keys(cls, keys, actions=0):
+        buttons = actions
+        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            buttons |= cls.LEFT
+        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            buttons |= cls.RIGHT
+        if keys[pygame.K_UP] or keys[pygame.K_w]:
+            buttons |= cls.UP
+        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+            buttons |= cls.DOWN
+        return cls(buttons)
+
+    @property
+    def left(self):
+        return bool(self.buttons & self.LEFT)
+
+    @property
+    def right(self):
+        return bool(self.buttons & self.RIGHT)
+
+    @property
+    def up(self):
+        return bool(self.buttons & self.UP)
+
+    @property
+    def down(self):
+        return bool(self.buttons & self.DOWN)
+
+    @property
+    def use_health(self):
+        return bool(self.buttons & self.USE_HEALTH)
+
+    @property
+    def use_ammo(self):
+        return bool(self.buttons & self.USE_AMMO)
+
+
+class Simulation:
+    # Núcleo do jogo sem janela nem relógio de parede: o tempo só avança pelo dt recebido
+    def __init__(self, seed=None, streaming=False, workers=SIM_WORKERS, cache_dir=None):
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.world_grid = WorldGrid(self.seed, streaming, workers, cache_dir)
+        self.player = Player(AREA_WIDTH // 2, AREA_HEIGHT // 2)
+        self.elapsed = 0.0
+        self.tick_count = 0
+        self.state = "playing"
+
+    def set_view(self, width, height):
+        # Região que a câmera mostra, em unidades do mundo: define o nível 0 do LOD
+        self.world_grid.view_size = (width, height)
+
+    @property
+    def remaining_time(self):
+        return max(0.0, GAME_DURATION - self.elapsed)
+
+    def step(self, dt, inputs):
+        events = []
+        if self.state != "playing":
+            return events
+        if inputs.use_health:
+            self.player.use_health_item()
+        if inputs.use_ammo and self.player.use_ammo_item(self.world_grid):
+            events.append(("ammo", self.player.rect.center))
+        if not self.player.is_alive:
+            self.state = "game_over"
+            return events
+        if self.elapsed >= GAME_DURATION:
+            self.state = "win_screen"
+            return events
+        self.tick_count += 1
+        self.elapsed += dt
+        self.player.save_position()
+        self.world_grid.npc_engine.save_positions()
+        with profiler.scope("player.update"):
+            self.player.update(dt, inputs)
+        with profiler.scope("world.update_active_areas"):
+            self.world_grid.update_active_areas(self.player.x, self.player.y, self.player.velocity)
+        with profiler.scope("world.update"):
+            if self.world_grid.update(dt, self.player):
+                events.append(("hit", self.player.rect.center))
+        with profiler.scope("check_collisions"):
+            for item in self.check_collisions():
+                events.append(("pickup", item.rect.center))
+        return events
+
+    def close(self):
+        self.world_grid.close()
+
+    def check_collisions(self):
+        if not self.player.is_alive:
+            return []
+        collected = self.world_grid.collect_items(self.player.get_rect())
+        for item in collected:
+            if item.item_type == "health":
+                self.player.health = min(self.player.max_health, self.player.health + HEALTH_RESTORE)
+            elif item.item_type == "ammo":
+                self.player.ammo_items += 1
+        return collected
@@ -1,11 +1,144 @@
+from collections import OrderedDict
+
 import pygame
 
+from settings import ASSET_CACHE_MAX_BYTES
+
+FLIP_X = 1
+FLIP_Y = 2
+
+
+def to_display_format(surface, alpha=True):
+    # Sem janela (modo headless) não há formato de tela para converter
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+class AssetRegistry:
+    # Decodifica cada sheet uma única vez e recorta cada frame uma única vez.
+    # As Surfaces devolvidas são compartilhadas: quem precisar alterar deve usar .copy().
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        # TextureAtlas opcional: recortes prontos no lugar de decodificar os PNGs
+        self.atlas = None
+        self.sheets = OrderedDict()
+        self.frames = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _surface_bytes(surface):
+        width, height = surface.get_size()
+        return width * height * surface.get_bytesize()
+
+    def get_sheet(self, filename, alpha=True):
+        key = (filename, alpha)
+        sheet = self.sheets.get(key)
+        if sheet is not None:
+            self.sheets.move_to_end(key)
+            self.hits += 1
+            return sheet
+        self.misses += 1
+        image = self.atlas.sheet(filename) if self.atlas is not None else None
+        sheet = to_display_format(image if image is not None else pygame.image.load(filename), alpha)
+        self.sheets[key] = sheet
+        self.size_bytes += self._surface_bytes(sheet)
+        self._enforce_budget()
+        return sheet
+
+    def get_frame(self, filename, x, y, width, height, flags=0):
+        key = (filename, (x, y, width, height), flags)
+        frame = self.frames.get(key)
+        if frame is not None:
+            self.frames.move_to_end(key)
+            self.hits += 1
+            return frame
+        frame = self.atlas.frame(filename, (x, y, width, height), flags) if self.atlas is not None else None
+        if frame is None:
+            sheet = self.get_sheet(filename)
+            frame = pygame.Surface((width, height), pygame.SRCALPHA)
+            frame.blit(sheet, (0, 0), (x, y, width, height))
+            if flags:
+                frame = pygame.transform.flip(frame, bool(flags & FLIP_X), bool(flags & FLIP_Y))
+        self.misses += 1
+        self.frames[key] = frame
+        self.size_bytes += self._surface_bytes(frame)
+        self._enforce_budget()
+        return frame
+
+    def get_frames(self, filename, rects, flags=0):
+        return [self.get_frame(filename, *rect, flags=flags) for rect in rects]
+
+    def get_strip(self, filename, width, height, count, row=0, flags=0):
+        return [
+            self.get_frame(filename, col * width, row * height, width, height, flags)
+            for col in range(count)
+        ]
+
+    def use_atlas(self, atlas):
+        self.atlas = atlas
+        self.evict()
+
+    def set_budget(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._enforce_budget()
+
+    def _enforce_budget(self):
+        if self.max_bytes is None:
+            return
+        # Frames saem antes das sheets: recortar de novo é mais barato que decodificar o PNG
+        while self.size_bytes > self.max_bytes and len(self.frames) > 1:
+            _, frame = self.frames.popitem(last=False)
+            self.size_bytes -= self._surface_bytes(frame)
+            self.evictions += 1
+        while self.size_bytes > self.max_bytes and len(self.sheets) > 1:
+            _, sheet = self.sheets.popitem(last=False)
+            self.size_bytes -= self._surface_bytes(sheet)
+            self.evictions += 1
+
+    def evict(self, filename=None):
+        if filename is None:
+            self.evictions += len(self.sheets) + len(self.frames)
+            self.sheets.clear()
+            self.frames.clear()
+            self.size_bytes = 0
+            return
+        for key in [k for k in self.sheets if k[0] == filename]:
+            self.size_bytes -= self._surface_bytes(self.sheets.pop(key))
+            self.evictions += 1
+        for key in [k for k in self.frames if k[0] == filename]:
+            self.size_bytes -= self._surface_bytes(self.frames.pop(key))
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "sheets": len(self.sheets),
+            "frames": len(self.frames),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+asset_registry = AssetRegistry(ASSET_CACHE_MAX_BYTES)
+
+
 class SpriteSheet:
-    def __init__(self, filename):
-        self.sheet = pygame.image.load(filename).convert_alpha()
+    def __init__(self, filename, registry=asset_registry):
+        self.filename = filename
+        self.registry = registry
 
-    def get_image(self, x, y, width, height):
-        image = pygame.Surface((width, height), pygame.SRCALPHA)
-        image.blit(self.sheet, (0, 0), (x, y, width, height))
-        return image
+    @property
+    def sheet(self):
+        # Só decodifica a sheet inteira se alguém pedir: com atlas os frames não precisam dela
+        return self.registry.get_sheet(self.filename)
 
+    def get_image(self, x, y, width, height):
+        return self.registry.get_frame(self.filename, x, y, width, height)
@@ -1,134 +1,340 @@
-import math
-import random
+import numpy as np
+import pygame
 
+from entities.AnimationClock import animation_clock
+from entities.EntityPool import entity_pool
 from entities.Npc.Droid import Droid
+from entities.Npc.NPCEngine import NPCEngine
 from entities.Item import Item
 from entities.Npc.Spider import Spider
 from settings import (
     AREA_WIDTH,
     AREA_HEIGHT,
+    GROUND_CHUNK_SIZE,
 )
-from sprites import SpriteSheet
+from sprites import SpriteSheet, to_display_format
+
+SPIDER, DROID = 0, 1
+HEALTH, AMMO = 0, 1
+GROUND_TILE_COUNT = 9
+TILE_SIZE = 16
+TILE_COLS = -(-AREA_WIDTH // TILE_SIZE)
+TILE_ROWS = -(-AREA_HEIGHT // TILE_SIZE)
+# Quantidades sorteadas por área (mínimo, máximo); os máximos dimensionam o GenerationCache
+DECORATION_COUNT = (10, 25)
+NPC_COUNT = (5, 15)
+HEALTH_ITEM_COUNT = (2, 5)
+AMMO_ITEM_COUNT = (1, 3)
+# Valor reservado no tile_grid para tiles bloqueados (o FlowField desvia deles)
+WALL_TILE = 255
+# (arquivo, tamanho, colunas, linhas) de cada sheet de marcas, na ordem dos índices
+MARK_SHEETS = (
+    ("assets/marks_16.png", 16, 14, 5),
+    ("assets/marks_48.png", 48, 3, 1),
+)
+MARK_SIZES = np.array([size for _, size, cols, rows in MARK_SHEETS for _ in range(cols * rows)], dtype=np.int64)
+NPC_TYPES = {SPIDER: Spider, DROID: Droid}
+NPC_KINDS = {npc_type: kind for kind, npc_type in NPC_TYPES.items()}
+ITEM_TYPES = {HEALTH: "health", AMMO: "ammo"}
+ITEM_KINDS = {item_type: kind for kind, item_type in ITEM_TYPES.items()}
+
+
+def generate_area(seed, grid_x, grid_y):
+    # Função pura de (seed, grid_x, grid_y): o conteúdo não depende da ordem de
+    # carregamento nem de quem gerou antes. Só arrays numpy, sem pygame, então roda
+    # numa thread de streaming. seed None sorteia um mundo novo.
+    rng = np.random.default_rng(None if seed is None else (seed, grid_x, grid_y))
+    world_x, world_y = grid_x * AREA_WIDTH, grid_y * AREA_HEIGHT
+    tiles = rng.integers(GROUND_TILE_COUNT, size=(TILE_ROWS, TILE_COLS), dtype=np.uint8)
+
+    count = rng.integers(DECORATION_COUNT[0], DECORATION_COUNT[1] + 1)
+    marks = rng.integers(len(MARK_SIZES), size=count)
+    sizes = MARK_SIZES[marks]
+    decorations = np.column_stack(
+        (marks, world_x + rng.integers(0, AREA_WIDTH - sizes + 1), world_y + rng.integers(0, AREA_HEIGHT - sizes + 1))
+    )
+
+    count = rng.integers(NPC_COUNT[0], NPC_COUNT[1] + 1)
+    npcs = np.column_stack(
+        (
+            np.where(rng.random(count) < 0.7, SPIDER, DROID),
+            world_x + rng.integers(50, AREA_WIDTH - 50 + 1, size=count),
+            world_y + rng.integers(50, AREA_HEIGHT - 50 + 1, size=count),
+        )
+    )
+
+    health = rng.integers(HEALTH_ITEM_COUNT[0], HEALTH_ITEM_COUNT[1] + 1)
+    ammo = rng.integers(AMMO_ITEM_COUNT[0], AMMO_ITEM_COUNT[1] + 1)
+    count = health + ammo
+    items = np.column_stack(
+        (
+            np.repeat((HEALTH, AMMO), (health, ammo)),
+            world_x + rng.integers(25, AREA_WIDTH - 25 + 1, size=count),
+            world_y + rng.integers(25, AREA_HEIGHT - 25 + 1, size=count),
+            np.concatenate((np.zeros(health, dtype=np.int64), rng.integers(3, size=ammo))),
+        )
+    )
+
+    return {
+        "tiles": tiles,
+        "decorations": decorations.astype(np.int32),
+        "npcs": npcs.astype(np.int32),
+        "items": items.astype(np.int32),
+    }
+
 
 class Area:
-    def __init__(self, grid_x, grid_y):
+    def __init__(self, grid_x, grid_y, npc_engine=None, seed=None, generation_cache=None):
         self.grid_x = grid_x
         self.grid_y = grid_y
+        self.coord = (grid_x, grid_y)
         self.world_x = grid_x * AREA_WIDTH
         self.world_y = grid_y * AREA_HEIGHT
         self.ground_tiles = []
         self.decorations = []
-        self.tile_map = []
-        self.tile_size = 16
+        self.tile_size = TILE_SIZE
+        self.tile_cols = TILE_COLS
+        self.tile_rows = TILE_ROWS
+        self.tile_grid = None
+        self.walkable = None
+        # Nenhum tile bloqueado: o FlowField não precisa montar a janela
+        self.open = True
+        self.decoration_records = None
+        self.ground_chunks = []
         self.is_active = False
         self.is_loaded = False
+        self.lod_elapsed = 0.0
         self.npcs = []
+        self.slots = np.empty(0, dtype=np.intp)
         self.items = []
+        self.npc_engine = npc_engine if npc_engine is not None else NPCEngine()
+        self.seed = seed
+        self.generation_cache = generation_cache
 
-    def load(self):
+    def load(self, data=None):
         if self.is_loaded:
             return
+        assets = self.load_assets()
+        self.build(self.prepare(assets, data), assets)
+
+    def load_assets(self):
+        # Frames vêm do asset_registry, que só pode ser usado na thread principal
+        assets = {"ground": None, "marks": None}
         try:
             ground_spritesheet = SpriteSheet("assets/ground_tileset.png")
-            for row in range(3):
-                for col in range(3):
-                    tile = ground_spritesheet.get_image(
-                        col * self.tile_size,
-                        row * self.tile_size,
-                        self.tile_size,
-                        self.tile_size,
-                    )
-                    self.ground_tiles.append(tile)
-
-            for y in range(0, AREA_HEIGHT, self.tile_size):
-                for x in range(0, AREA_WIDTH, self.tile_size):
-                    chosen_tile = random.choice(self.ground_tiles)
-                    self.tile_map.append((chosen_tile, (x, y)))
+            assets["ground"] = [
+                ground_spritesheet.get_image(
+                    col * self.tile_size, row * self.tile_size, self.tile_size, self.tile_size
+                )
+                for row in range(3)
+                for col in range(3)
+            ]
         except:
-            self.ground_tiles = None
-
+            pass
         try:
             all_marks = []
-            marks_16_sheet = SpriteSheet("assets/marks_16.png")
-            for row in range(5):
-                for col in range(14):
-                    all_marks.append(
-                        marks_16_sheet.get_image(col * 16, row * 16, 16, 16)
-                    )
-            marks_48_sheet = SpriteSheet("assets/marks_48.png")
-            for i in range(3):
-                all_marks.append(marks_48_sheet.get_image(i * 48, 0, 48, 48))
-            for _ in range(random.randint(10, 25)):
-                mark_image = random.choice(all_marks)
-                pos_x = self.world_x + random.randint(0, AREA_WIDTH - mark_image.get_width())
-                pos_y = self.world_y + random.randint(0, AREA_HEIGHT - mark_image.get_height())
-                self.decorations.append((mark_image, (pos_x, pos_y)))
+            for filename, size, cols, rows in MARK_SHEETS:
+                sheet = SpriteSheet(filename)
+                for row in range(rows):
+                    for col in range(cols):
+                        all_marks.append(sheet.get_image(col * size, row * size, size, size))
+            assets["marks"] = all_marks
         except:
             pass
+        return assets
+
+    def prepare(self, assets, data=None):
+        # Tudo que não precisa da thread principal: geração (ou o estado dormente
+        # vindo do cache) e chunks ainda sem converter
+        data = self.generate() if data is None else dict(data)
+        data["chunks"] = self._bake_ground_chunks(data, assets)
+        return data
+
+    def generate(self):
+        # Áreas já geradas em outra execução vêm do GenerationCache (memory-mapped)
+        cache = self.generation_cache
+        data = cache.get(self.coord) if cache is not None else None
+        if data is None:
+            data = generate_area(self.seed, self.grid_x, self.grid_y)
+            if cache is not None:
+                cache.put(self.coord, data)
+        return data
 
-        # NPCs
-        for _ in range(random.randint(5, 15)):
-            x = self.world_x + random.randint(50, AREA_WIDTH - 50)
-            y = self.world_y + random.randint(50, AREA_HEIGHT - 50)
-            if random.random() < 0.7:
-                self.npcs.append(Spider(x, y, self))
-            else:
-                self.npcs.append(Droid(x, y, self))
-
-        # Itens
-        for _ in range(random.randint(2, 5)):
-            x = self.world_x + random.randint(25, AREA_WIDTH - 25)
-            y = self.world_y + random.randint(25, AREA_HEIGHT - 25)
-            self.items.append(Item(x, y, "health"))
-        for _ in range(random.randint(1, 3)):
-            x = self.world_x + random.randint(25, AREA_WIDTH - 25)
-            y = self.world_y + random.randint(25, AREA_HEIGHT - 25)
-            self.items.append(Item(x, y, "ammo"))
+    def build(self, data, assets):
+        # Parte que precisa da thread principal: conversão das Surfaces e entidades
+        if self.is_loaded:
+            return
+        self.tile_grid = data["tiles"]
+        self.walkable = self.tile_grid != WALL_TILE
+        self.open = bool(self.walkable.all())
+        self.decoration_records = data["decorations"]
+        self.ground_tiles = assets["ground"]
+        self.decorations = []
+        if assets["marks"]:
+            for mark, pos_x, pos_y in data["decorations"].tolist():
+                self.decorations.append((assets["marks"][mark], (pos_x, pos_y)))
+        self.ground_chunks = [
+            (to_display_format(chunk, alpha=assets["ground"] is None), chunk_rect)
+            for chunk, chunk_rect in data["chunks"]
+        ]
+
+        for kind, x, y in data["npcs"].tolist():
+            self.npcs.append(entity_pool.acquire(NPC_TYPES[kind], x, y, self))
+        self.slots = np.fromiter((npc.slot for npc in self.npcs), dtype=np.intp, count=len(self.npcs))
+        if "npc_state" in data:
+            for npc, (x, y, health, cooldown) in zip(self.npcs, data["npc_state"].tolist()):
+                self.npc_engine.restore(npc.slot, x, y, health, cooldown)
+        for kind, x, y, variant in data["items"].tolist():
+            item = entity_pool.acquire(Item, x, y, ITEM_TYPES[kind], variant)
+            item.list_index = len(self.items)
+            self.items.append(item)
+        self.compact()
 
         self.is_loaded = True
 
-    def get_distance_to_player(self, player_x, player_y):
-        center_x = self.world_x + AREA_WIDTH // 2
-        center_y = self.world_y + AREA_HEIGHT // 2
-        return math.sqrt((player_x - center_x) ** 2 + (player_y - center_y) ** 2)
+    def _bake_ground_chunks(self, data, assets):
+        # Chão e decorações são estáticos: desenhados uma vez em chunks ao carregar
+        chunks = []
+        ground_tiles = assets["ground"]
+        tile_grid = data["tiles"]
+        marks = assets["marks"] or []
+        decorations = [
+            (marks[mark], (pos_x, pos_y)) for mark, pos_x, pos_y in data["decorations"].tolist()
+        ] if marks else []
+        size = GROUND_CHUNK_SIZE
+        for chunk_y in range(0, AREA_HEIGHT, size):
+            for chunk_x in range(0, AREA_WIDTH, size):
+                width = min(size, AREA_WIDTH - chunk_x)
+                height = min(size, AREA_HEIGHT - chunk_y)
+                if ground_tiles:
+                    chunk = pygame.Surface((width, height))
+                    col_start = chunk_x // self.tile_size
+                    row_start = chunk_y // self.tile_size
+                    col_end = min(self.tile_cols, -(-(chunk_x + width) // self.tile_size))
+                    row_end = min(self.tile_rows, -(-(chunk_y + height) // self.tile_size))
+                    chunk.blits(
+                        [
+                            (
+                                ground_tiles[tile_grid[row, col]],
+                                (col * self.tile_size - chunk_x, row * self.tile_size - chunk_y),
+                            )
+                            for row in range(row_start, row_end)
+                            for col in range(col_start, col_end)
+                        ],
+                        doreturn=False,
+                    )
+                else:
+                    chunk = pygame.Surface((width, height), pygame.SRCALPHA)
+                world_x = self.world_x + chunk_x
+                world_y = self.world_y + chunk_y
+                chunk_rect = pygame.Rect(world_x, world_y, width, height)
+                chunk.blits(
+                    [
+                        (image, (pos_x - world_x, pos_y - world_y))
+                        for image, (pos_x, pos_y) in decorations
+                        if chunk_rect.colliderect((pos_x, pos_y, *image.get_size()))
+                    ],
+                    doreturn=False,
+                )
+                chunks.append((chunk, chunk_rect))
+        return chunks
+
+    def snapshot(self):
+        # Forma dormente compacta: sem Surfaces, sem NPCs mortos nem itens coletados
+        npcs = [npc for npc in self.npcs if npc.is_alive]
+        slots = np.fromiter((npc.slot for npc in npcs), dtype=np.intp, count=len(npcs))
+        engine = self.npc_engine
+        items = [item for item in self.items if not item.collected]
+        return {
+            "tiles": self.tile_grid,
+            "decorations": self.decoration_records,
+            "npcs": np.array(
+                [(NPC_KINDS[type(npc)], 0, 0) for npc in npcs], dtype=np.int32
+            ).reshape(-1, 3),
+            "npc_state": np.column_stack(
+                (engine.pos[slots], engine.health[slots], engine.cooldown[slots])
+            ),
+            "items": np.array(
+                [(ITEM_KINDS[item.item_type], item.rect.x, item.rect.y, item.variant) for item in items],
+                dtype=np.int32,
+            ).reshape(-1, 4),
+        }
+
+    def compact(self):
+        # Swap-remove dos NPCs mortos: o último da lista ocupa o lugar do removido
+        alive = self.npc_engine.alive
+        npcs, slots = self.npcs, self.slots
+        i, n = 0, len(npcs)
+        while i < n:
+            if alive[slots[i]]:
+                i += 1
+                continue
+            entity_pool.release(npcs[i])
+            n -= 1
+            npcs[i] = npcs[n]
+            slots[i] = slots[n]
+            npcs.pop()
+        self.slots = slots[:n]
+
+    def remove_item(self, item):
+        last = self.items.pop()
+        if last is not item:
+            self.items[item.list_index] = last
+            last.list_index = item.list_index
+        entity_pool.release(item)
 
     def unload(self):
+        for npc in self.npcs:
+            entity_pool.release(npc)
         self.npcs.clear()
+        self.slots = np.empty(0, dtype=np.intp)
+        for item in self.items:
+            entity_pool.release(item)
         self.items.clear()
+        self.ground_chunks = []
+        self.decorations = []
+        self.tile_grid = None
+        self.walkable = None
+        self.open = True
+        self.decoration_records = None
         self.is_loaded = False
 
     def activate(self):
         if not self.is_loaded:
             self.load()
         self.is_active = True
+        self.npc_engine.set_active(self.slots, True)
 
     def deactivate(self):
         self.is_active = False
+        self.npc_engine.set_active(self.slots, False)
 
-    def update(self, dt, player):
-        # Só atualiza NPCs se a área estiver ativa
-        if not self.is_active:
-            return
-        for npc in self.npcs:
-            npc.update(dt, player)
-
-    def draw(self, surface, viewport):
+    def submit(self, queue, viewport, alpha=1.0):
+        # Só coleta o que está na tela; o desenho é feito em lote pela RenderQueue
         if not self.is_loaded:
             return
-        if self.ground_tiles:
-            for tile_image, (local_x, local_y) in self.tile_map:
-                world_x = self.world_x + local_x
-                world_y = self.world_y + local_y
-                if viewport.is_visible(world_x, world_y, self.tile_size, self.tile_size):
-                    screen_x, screen_y = viewport.world_to_screen(world_x, world_y)
-                    surface.blit(tile_image, (screen_x, screen_y))
-        for image, (world_x, world_y) in self.decorations:
-            if viewport.is_visible(world_x, world_y, image.get_width(), image.get_height()):
-                screen_pos = viewport.world_to_screen(world_x, world_y)
-                surface.blit(image, screen_pos)
+        for chunk, chunk_rect in self.ground_chunks:
+            if viewport.is_visible(*chunk_rect):
+                queue.ground.append((viewport.scale(chunk), viewport.world_to_screen(chunk_rect.x, chunk_rect.y)))
         for item in self.items:
-            if viewport.is_visible(item.rect.x, item.rect.y, item.rect.width, item.rect.height):
-                item.draw(surface, viewport)
-        for npc in self.npcs:
-            if viewport.is_visible(npc.rect.x, npc.rect.y, npc.rect.width, npc.rect.height):
-                npc.draw(surface, viewport)
+            if viewport.is_visible(*item.rect):
+                queue.items.append((viewport.scale(item.image), viewport.world_to_screen(item.rect.x, item.rect.y)))
+        if not len(self.slots):
+            return
+        engine = self.npc_engine
+        positions = engine.render_positions(self.slots, alpha).astype(np.int64)
+        sizes = engine.size[self.slots].astype(np.int64)
+        visible = np.flatnonzero(engine.alive[self.slots] & viewport.visible_mask(positions, sizes))
+        if not len(visible):
+            return
+        screen = viewport.to_screen(positions[visible]).tolist()
+        slots = self.slots[visible]
+        health = engine.health[slots].tolist()
+        max_health = engine.max_health[slots].tolist()
+        widths = sizes[visible, 0].tolist()
+        images = animation_clock.frames_for(engine.anim[slots], engine.phase[slots])
+        zoom = viewport.zoom
+        for i, (sx, sy) in enumerate(screen):
+            queue.npcs.append((viewport.scale(images[i]), (sx, sy)))
+            if health[i] < max_health[i]:
+                queue.add_health_bar(sx, sy - 7 * zoom, widths[i] * zoom, 4 * zoom, health[i] / max_health[i])
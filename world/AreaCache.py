@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+from settings import AREA_CACHE_MAX_BYTES
+
+
+class AreaCache:
+    # Áreas descarregadas ficam aqui na forma dormente (só arrays, sem Surfaces),
+    # em LRU limitado por bytes. Reativar uma área em cache a restaura como estava.
+    def __init__(self, max_bytes=AREA_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, coord):
+        return coord in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def _entry_bytes(data):
+        return sum(array.nbytes for array in data.values())
+
+    def put(self, coord, data):
+        if coord in self.entries:
+            self.size_bytes -= self._entry_bytes(self.entries.pop(coord))
+        self.entries[coord] = data
+        self.size_bytes += self._entry_bytes(data)
+        self._enforce_budget()
+
+    def take(self, coord):
+        data = self.entries.pop(coord, None)
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.size_bytes -= self._entry_bytes(data)
+        return data
+
+    def set_budget(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._enforce_budget()
+
+    def _enforce_budget(self):
+        if self.max_bytes is None:
+            return
+        while self.size_bytes > self.max_bytes and self.entries:
+            _, data = self.entries.popitem(last=False)
+            self.size_bytes -= self._entry_bytes(data)
+            self.evictions += 1
+
+    def clear(self):
+        self.evictions += len(self.entries)
+        self.entries.clear()
+        self.size_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "areas": len(self.entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+        }
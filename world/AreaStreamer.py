@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from settings import STREAMING_WORKERS
+
+
+class AreaStreamer:
+    # Gera e desenha os chunks das áreas (Area.prepare) em threads; a thread
+    # principal só converte as Surfaces e cria as entidades (Area.build).
+    def __init__(self, workers=STREAMING_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="area-stream")
+        self.pending = {}
+        self.requested = 0
+        self.blocking_waits = 0
+
+    def request(self, area, data=None):
+        if area.is_loaded or area.coord in self.pending:
+            return
+        assets = area.load_assets()
+        self.pending[area.coord] = (assets, self.executor.submit(area.prepare, assets, data), data)
+        self.requested += 1
+
+    def is_pending(self, coord):
+        return coord in self.pending
+
+    def take(self, coord):
+        pending = self.pending.get(coord)
+        if pending is None or not pending[1].done():
+            return None
+        del self.pending[coord]
+        assets, future, _ = pending
+        return future.result(), assets
+
+    def wait(self, coord):
+        assets, future, _ = self.pending.pop(coord)
+        if not future.done():
+            self.blocking_waits += 1
+        return future.result(), assets
+
+    def cancel(self, coord):
+        # Devolve o estado dormente que foi entregue no request, se havia
+        pending = self.pending.pop(coord, None)
+        if pending is None:
+            return None
+        pending[1].cancel()
+        return pending[2]
+
+    def shutdown(self):
+        for _, future, _ in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,150 @@
+import numpy as np
+
+from settings import AREA_WIDTH, AREA_HEIGHT, FLOW_TILE_SIZE
+
+# Vizinhos na ordem de preferência de desempate: ortogonais antes das diagonais
+NEIGHBORS = np.array(
+    [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)], dtype=np.int64
+)
+DIRECTIONS = NEIGHBORS / np.hypot(NEIGHBORS[:, 0], NEIGHBORS[:, 1])[:, None]
+
+
+class FlowField:
+    # Campo de fluxo compartilhado por todos os NPCs: um BFS (8 vizinhos, sem cortar
+    # quina) a partir do tile do jogador sobre a janela de tiles das áreas ativas.
+    # Só é refeito quando o jogador troca de tile ou o conjunto de áreas muda; cada
+    # NPC consulta o seu tile em O(1).
+    # Obs.: generate_area ainda não coloca WALL_TILE, então no jogo todas as áreas são
+    # abertas, update não calcula nada e os NPCs andam em linha reta; com paredes,
+    # move_slots também as respeita.
+    def __init__(self, tile_size=FLOW_TILE_SIZE):
+        self.tile_size = tile_size
+        self.key = None
+        self.origin = (0, 0)
+        self.shape = (0, 0)
+        self.cost = None
+        self.direction = None
+        self.direct = None
+        self.walkable = None
+        self.open = True
+        self.rebuilds = 0
+
+    def update(self, areas, player_x, player_y):
+        if all(area.open for area in areas):
+            # Nenhuma área ativa com parede: sem campo, nem a chave é montada
+            if not self.open:
+                self.open = True
+                self.cost = self.direction = self.direct = self.walkable = None
+            self.key = None
+            return False
+        goal = (int(player_x // self.tile_size), int(player_y // self.tile_size))
+        key = (goal, tuple(sorted(area.coord for area in areas)))
+        if key == self.key:
+            return False
+        self.key = key
+        origin, walkable = self._window(areas)
+        self.rebuild(walkable, origin, goal)
+        return True
+
+    def _window(self, areas):
+        # Tiles globais (alinhados à origem do mundo) cobrindo as áreas ativas. Cada tile
+        # herda a passabilidade do tile da área que contém o seu centro; buracos da janela
+        # (fora de qualquer área ativa) contam como livres.
+        size = self.tile_size
+        x0 = min(area.world_x for area in areas) // size
+        y0 = min(area.world_y for area in areas) // size
+        x1 = -(-max(area.world_x + AREA_WIDTH for area in areas) // size)
+        y1 = -(-max(area.world_y + AREA_HEIGHT for area in areas) // size)
+        walkable = np.ones((y1 - y0, x1 - x0), dtype=np.bool_)
+        for area in areas:
+            if area.walkable is None or area.open:
+                continue
+            cols = np.arange(area.world_x // size, -(-(area.world_x + AREA_WIDTH) // size))
+            rows = np.arange(area.world_y // size, -(-(area.world_y + AREA_HEIGHT) // size))
+            local_cols = np.clip((cols * size + size // 2 - area.world_x) // area.tile_size, 0, area.tile_cols - 1)
+            local_rows = np.clip((rows * size + size // 2 - area.world_y) // area.tile_size, 0, area.tile_rows - 1)
+            walkable[np.ix_(rows - y0, cols - x0)] = area.walkable[np.ix_(local_rows, local_cols)]
+        return (x0, y0), walkable
+
+    def rebuild(self, walkable, origin, goal):
+        self.rebuilds += 1
+        self.origin = origin
+        self.shape = walkable.shape
+        # Sem nenhum tile bloqueado a linha reta é sempre o menor caminho: não há campo
+        self.open = bool(walkable.all())
+        if self.open:
+            self.cost = self.direction = self.direct = self.walkable = None
+            return
+        self.walkable = walkable
+        rows, cols = self.shape
+        # Borda de paredes: os deslocamentos dos vizinhos nunca saem do array
+        stride = cols + 2
+        padded = np.zeros((rows + 2, stride), dtype=np.bool_)
+        padded[1:-1, 1:-1] = walkable
+        gx, gy = goal[0] - origin[0], goal[1] - origin[1]
+        inside = 0 <= gx < cols and 0 <= gy < rows
+        if inside:
+            padded[gy + 1, gx + 1] = True
+        passable = padded.ravel()
+        offsets = NEIGHBORS[:, 0] + NEIGHBORS[:, 1] * stride
+        cells = np.flatnonzero(passable)
+        # Vizinhos válidos de cada tile livre; diagonal só com os dois ortogonais livres
+        valid = passable[cells[:, None] + offsets]
+        valid[:, 4:] &= passable[cells[:, None] + NEIGHBORS[4:, 0]] & passable[cells[:, None] + NEIGHBORS[4:, 1] * stride]
+        row_of = np.zeros(len(passable), dtype=np.int64)
+        row_of[cells] = np.arange(len(cells))
+
+        cost = np.full(len(passable), -1, dtype=np.int32)
+        if inside:
+            start = (gy + 1) * stride + gx + 1
+            cost[start] = 0
+            frontier = np.array([start], dtype=np.int64)
+            owner = np.zeros(len(passable), dtype=np.int64)
+            step = 0
+            while len(frontier):
+                step += 1
+                candidates = frontier[:, None] + offsets
+                reached = candidates[valid[row_of[frontier]] & (cost[candidates] < 0)]
+                # Remove repetidos sem ordenar: fica a primeira ocorrência de cada tile
+                order = np.arange(len(reached))
+                owner[reached[::-1]] = order[::-1]
+                frontier = reached[owner[reached] == order]
+                cost[frontier] = step
+
+        # Direção de cada tile: o vizinho alcançável de menor custo
+        unreachable = np.iinfo(np.int32).max
+        neighbor_cost = np.where(valid, cost[cells[:, None] + offsets], unreachable).astype(np.int64)
+        neighbor_cost[neighbor_cost < 0] = unreachable
+        direction = np.zeros((len(passable), 2))
+        direction[cells] = DIRECTIONS[np.argmin(neighbor_cost, axis=1)]
+
+        inner = (slice(1, -1), slice(1, -1))
+        self.cost = cost.reshape(rows + 2, stride)[inner]
+        self.direction = direction.reshape(rows + 2, stride, 2)[inner]
+        # Sem obstáculo no caminho o custo do BFS é a distância de Chebyshev: nesses tiles
+        # o NPC segue reto para o jogador, como antes do campo existir
+        ys, xs = np.indices(self.shape)
+        self.direct = (self.cost <= 0) | (self.cost == np.maximum(np.abs(xs - gx), np.abs(ys - gy)))
+
+    def _tiles(self, points):
+        # Tile da janela de cada ponto e se ele cai dentro da janela
+        tiles = np.floor(points / self.tile_size).astype(np.int64) - self.origin
+        rows, cols = self.shape
+        inside = (tiles[:, 0] >= 0) & (tiles[:, 0] < cols) & (tiles[:, 1] >= 0) & (tiles[:, 1] < rows)
+        return np.where(inside, tiles[:, 0], 0), np.where(inside, tiles[:, 1], 0), inside
+
+    def walkable_at(self, points):
+        # Tile livre em cada ponto do mundo; fora da janela conta como livre
+        if self.open or self.walkable is None:
+            return np.ones(len(points), dtype=np.bool_)
+        tx, ty, inside = self._tiles(points)
+        return ~inside | self.walkable[ty, tx]
+
+    def sample(self, centers):
+        # (direção unitária, segue o campo?) para cada centro em coordenadas do mundo
+        count = len(centers)
+        if self.open or self.cost is None or not count:
+            return np.zeros((count, 2)), np.zeros(count, dtype=np.bool_)
+        tx, ty, inside = self._tiles(centers)
+        follow = inside & ~self.direct[ty, tx]
+        return self.direction[ty, tx], follow
@@ -0,0 +1,122 @@
+import os
+
+import numpy as np
+
+from settings import GRID_SIZE, GENERATION_CACHE_FILES
+from world.Area import (
+    TILE_ROWS,
+    TILE_COLS,
+    DECORATION_COUNT,
+    NPC_COUNT,
+    HEALTH_ITEM_COUNT,
+    AMMO_ITEM_COUNT,
+)
+
+MAGIC = b"RLGC"
+# Sobe quando generate_area muda: caches antigos são descartados
+VERSION = 1
+HEADER = np.dtype(
+    [("magic", "S4"), ("version", "<u4"), ("seed", "<u8"), ("grid_size", "<u4"), ("record_size", "<u4")]
+)
+FIELDS = (
+    ("decorations", DECORATION_COUNT[1], 3),
+    ("npcs", NPC_COUNT[1], 3),
+    ("items", HEALTH_ITEM_COUNT[1] + AMMO_ITEM_COUNT[1], 4),
+)
+# Registro de tamanho fixo por área: tiles + tabelas com capacidade máxima e contagens
+RECORD = np.dtype(
+    [("present", "u1"), ("counts", "<u1", len(FIELDS)), ("tiles", "u1", (TILE_ROWS, TILE_COLS))]
+    + [(name, "<i4", (capacity, width)) for name, capacity, width in FIELDS]
+)
+
+
+def cache_path(directory, seed):
+    # Um arquivo por seed: trocar de seed não mexe no arquivo que outra Simulation ainda usa
+    return os.path.join(directory, f"world_{seed}.bin")
+
+
+def prune_caches(directory, keep=GENERATION_CACHE_FILES):
+    # Seeds usadas há mais tempo saem primeiro. Apagar um arquivo ainda mapeado é seguro:
+    # o memmap continua com o inode até fechar.
+    try:
+        names = [name for name in os.listdir(directory) if name.startswith("world_") and name.endswith(".bin")]
+    except OSError:
+        return
+    paths = sorted((os.path.join(directory, name) for name in names), key=os.path.getmtime, reverse=True)
+    for path in paths[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class GenerationCache:
+    # Áreas geradas ficam num arquivo binário com um registro fixo por coordenada,
+    # aberto com np.memmap: abrir o cache não lê nada, e cada área só toca as páginas
+    # do próprio registro. O arquivo nasce esparso, do tamanho do mundo inteiro.
+    def __init__(self, path, seed, grid_size=GRID_SIZE):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        header = np.zeros((), dtype=HEADER)
+        header["magic"] = MAGIC
+        header["version"] = VERSION
+        header["seed"] = seed
+        header["grid_size"] = grid_size
+        header["record_size"] = RECORD.itemsize
+        size = HEADER.itemsize + grid_size * grid_size * RECORD.itemsize
+        if self._matches(header, size):
+            os.utime(path)
+        else:
+            # Arquivo novo ao lado e troca no fim: nunca trunca um arquivo mapeado
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            temp = path + ".tmp"
+            with open(temp, "wb") as file:
+                file.write(header.tobytes())
+                file.truncate(size)
+            os.replace(temp, path)
+        self.records = np.memmap(path, dtype=RECORD, mode="r+", offset=HEADER.itemsize, shape=(grid_size, grid_size))
+
+    def _matches(self, header, size):
+        try:
+            if os.path.getsize(self.path) != size:
+                return False
+            return np.fromfile(self.path, dtype=HEADER, count=1)[0].tobytes() == header.tobytes()
+        except (OSError, IndexError):
+            return False
+
+    def get(self, coord):
+        record = self.records[coord[1], coord[0]]
+        if not record["present"]:
+            self.misses += 1
+            return None
+        self.hits += 1
+        counts = record["counts"]
+        data = {"tiles": np.array(record["tiles"])}
+        for (name, _, _), count in zip(FIELDS, counts.tolist()):
+            data[name] = np.array(record[name][:count])
+        return data
+
+    def put(self, coord, data):
+        record = self.records[coord[1], coord[0]]
+        record["tiles"] = data["tiles"]
+        for index, (name, _, _) in enumerate(FIELDS):
+            rows = data[name]
+            record[name][: len(rows)] = rows
+            record["counts"][index] = len(rows)
+        # Marcado por último: um registro pela metade nunca é lido como pronto
+        record["present"] = 1
+
+    def close(self):
+        if self.records is not None:
+            self.records.flush()
+            self.records = None
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "file_bytes": os.path.getsize(self.path),
+        }
@@ -0,0 +1,165 @@
+import math
+
+import numpy as np
+
+
+class SpatialHash:
+    # Grade uniforme indexada pelo centro de cada entidade (chaves inteiras).
+    # Só as entidades que trocam de célula custam trabalho em Python no update.
+    def __init__(self, cell_size, capacity=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.capacity = 0
+        self.max_half = np.zeros(2)
+        self.centers = np.zeros((0, 2))
+        self.half = np.zeros((0, 2))
+        self.cell_coords = np.zeros((0, 2), dtype=np.int64)
+        self.present = np.zeros(0, dtype=np.bool_)
+        self._grow(capacity)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.present))
+
+    def __contains__(self, key):
+        return key < self.capacity and bool(self.present[key])
+
+    def _grow(self, capacity):
+        for name in ("centers", "half", "cell_coords", "present"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def _cell_of(self, cx, cy):
+        return int(cx // self.cell_size), int(cy // self.cell_size)
+
+    def insert(self, key, x, y, width, height):
+        if key >= self.capacity:
+            self._grow(max(key + 1, self.capacity * 2))
+        if self.present[key]:
+            self.remove(key)
+        half_w, half_h = width / 2, height / 2
+        cx, cy = x + half_w, y + half_h
+        cell = self._cell_of(cx, cy)
+        self.centers[key] = (cx, cy)
+        self.half[key] = (half_w, half_h)
+        self.cell_coords[key] = cell
+        self.present[key] = True
+        np.maximum(self.max_half, self.half[key], out=self.max_half)
+        self.cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key):
+        if key not in self:
+            return
+        cell = tuple(self.cell_coords[key].tolist())
+        bucket = self.cells[cell]
+        bucket.discard(key)
+        if not bucket:
+            del self.cells[cell]
+        self.present[key] = False
+
+    def update(self, keys, positions, sizes):
+        # positions são os cantos superiores esquerdos, como nos Rects
+        keys = np.asarray(keys, dtype=np.intp)
+        present = self.present[keys]
+        keys = keys[present]
+        half = sizes[present] / 2
+        centers = positions[present] + half
+        self.centers[keys] = centers
+        self.half[keys] = half
+        new_cells = np.floor_divide(centers, self.cell_size).astype(np.int64)
+        changed = np.flatnonzero((new_cells != self.cell_coords[keys]).any(axis=1))
+        if not len(changed):
+            return 0
+        cells = self.cells
+        moved_keys = keys[changed]
+        for key, old, new in zip(
+            moved_keys.tolist(), self.cell_coords[moved_keys].tolist(), new_cells[changed].tolist()
+        ):
+            old, new = tuple(old), tuple(new)
+            bucket = cells[old]
+            bucket.discard(key)
+            if not bucket:
+                del cells[old]
+            cells.setdefault(new, set()).add(key)
+        self.cell_coords[moved_keys] = new_cells[changed]
+        return len(changed)
+
+    def _candidates(self, left, top, right, bottom):
+        x0, y0 = self._cell_of(left, top)
+        x1, y1 = self._cell_of(right, bottom)
+        found = []
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        return np.fromiter(found, dtype=np.intp, count=len(found))
+
+    def query_radius(self, x, y, radius):
+        keys = self._candidates(x - radius, y - radius, x + radius, y + radius)
+        if not len(keys):
+            return keys
+        delta = self.centers[keys] - (x, y)
+        return keys[np.einsum("ij,ij->i", delta, delta) <= radius * radius]
+
+    def query_rect(self, left, top, width, height):
+        right, bottom = left + width, top + height
+        half_w, half_h = self.max_half
+        keys = self._candidates(left - half_w, top - half_h, right + half_w, bottom + half_h)
+        if not len(keys):
+            return keys
+        centers = self.centers[keys]
+        half = self.half[keys]
+        overlap = (
+            (centers[:, 0] - half[:, 0] < right) & (centers[:, 0] + half[:, 0] > left)
+            & (centers[:, 1] - half[:, 1] < bottom) & (centers[:, 1] + half[:, 1] > top)
+        )
+        return keys[overlap]
+
+    def query_pairs(self, radius):
+        # Pares (a, b) com a < b cujos centros estão a no máximo `radius`
+        reach = max(1, math.ceil(radius / self.cell_size))
+        offsets = [
+            (dx, dy)
+            for dx in range(-reach, reach + 1)
+            for dy in range(-reach, reach + 1)
+            if (dx, dy) > (0, 0)
+        ]
+        keys = np.flatnonzero(self.present)
+        if len(keys) < 2:
+            return np.zeros((0, 2), dtype=np.intp)
+        # Ordena as chaves pelo id da célula e casa cada célula com as vizinhas via searchsorted
+        span = 2 * reach + 1
+        cells = self.cell_coords[keys]
+        stride = int(cells[:, 1].max() - cells[:, 1].min()) + span + 1
+        cell_ids = cells[:, 0] * stride + cells[:, 1]
+        order = np.argsort(cell_ids, kind="stable")
+        keys, cell_ids = keys[order], cell_ids[order]
+        radius_sq = radius * radius
+        pairs = []
+        for dx, dy in [(0, 0)] + offsets:
+            target = cell_ids + dx * stride + dy
+            start = np.searchsorted(cell_ids, target, side="left")
+            if dx == dy == 0:
+                # Dentro da própria célula conta cada par uma vez só
+                start = np.arange(1, len(keys) + 1)
+            end = np.searchsorted(cell_ids, target, side="right")
+            counts = np.maximum(end - start, 0)
+            total = int(counts.sum())
+            if not total:
+                continue
+            owner = np.repeat(np.arange(len(keys)), counts)
+            first = np.cumsum(counts) - counts
+            other = start[owner] + np.arange(total) - first[owner]
+            a, b = keys[owner], keys[other]
+            delta = self.centers[a] - self.centers[b]
+            close = np.einsum("ij,ij->i", delta, delta) <= radius_sq
+            pairs.append(np.stack((a[close], b[close]), axis=1))
+        if not pairs:
+            return np.zeros((0, 2), dtype=np.intp)
+        pairs = np.concatenate(pairs)
+        pairs.sort(axis=1)
+        return pairs
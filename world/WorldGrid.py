@@ -1,49 +1,357 @@
+import math
+
+import numpy as np
+
 from settings import (
     GRID_SIZE,
+    AREA_WIDTH,
+    AREA_HEIGHT,
+    ACTIVATION_HYSTERESIS,
     MAX_ACTIVE_AREAS,
     AREA_ACTIVATION_DISTANCE,
+    SPATIAL_CELL_SIZE,
+    STREAMING_BUILDS_PER_FRAME,
+    PREFETCH_SECONDS,
+    LOD_VIEW_SIZE,
+    LOD_VIEW_MARGIN,
+    LOD_NEAR_INTERVAL,
+    LOD_FAR_INTERVAL,
+    LOD_MAX_STEP,
+    LOD_NPC_BUDGET,
+    LOD_LOAD_DISTANCE,
+    SIM_WORKERS,
 )
+from entities.Npc.NPCEngine import NPCEngine
+from entities.Npc.ParallelMover import ParallelMover
+from render_queue import RenderQueue
 from world.Area import Area
+from world.AreaCache import AreaCache
+from world.AreaStreamer import AreaStreamer
+from world.FlowField import FlowField
+from world.GenerationCache import GenerationCache, cache_path, prune_caches
+from world.SpatialHash import SpatialHash
 
 
 class WorldGrid:
-    def __init__(self):
+    def __init__(self, seed=None, streaming=False, workers=SIM_WORKERS, cache_dir=None):
+        self.seed = seed
+        # cache_dir: áreas geradas ficam em disco, um arquivo por seed, e são reaproveitadas
+        # entre execuções com a mesma seed; só as GENERATION_CACHE_FILES seeds mais recentes ficam
+        self.generation_cache = None
+        if cache_dir is not None and seed is not None:
+            self.generation_cache = GenerationCache(cache_path(cache_dir, seed), seed)
+            prune_caches(cache_dir)
+        # Áreas só existem como objeto enquanto estão carregadas ou em streaming;
+        # o resto do mundo é só coordenada (e, se já visitada, estado no area_cache)
         self.areas = {}
         self.active_areas = set()
-        for x in range(GRID_SIZE):
-            for y in range(GRID_SIZE):
-                self.areas[(x, y)] = Area(x, y)
+        self.loaded_areas = set()
+        self.target_areas = set()
+        self.wanted_areas = set()
+        self.last_activation = None
+        self.area_cache = AreaCache()
+        # Estado salvo num checkpoint ainda não restaurado: coord -> função que lê as colunas
+        self.saved_areas = {}
+        # Áreas que mudaram desde o último checkpoint: NPCs que andaram, levaram dano ou
+        # morreram, itens coletados. Continuam marcadas depois de descarregadas.
+        self.dirty_areas = set()
+        self.streamer = AreaStreamer() if streaming else None
+        # workers > 0: movimento dos NPCs dividido entre processos (memória compartilhada)
+        self.parallel = ParallelMover(workers) if workers else None
+        self.npc_engine = NPCEngine(parallel=self.parallel)
+        self.item_index = SpatialHash(SPATIAL_CELL_SIZE)
+        self.indexed_items = {}
+        self.free_item_keys = []
+        self.compacted_deaths = 0
+        self.render_queue = RenderQueue()
+        self.flow_field = FlowField()
+        self.lod_rng = np.random.default_rng(seed)
+        self.lod_tiers = ((), (), ())
+        # Tamanho (em unidades do mundo) da região mostrada pela câmera, centrada no jogador
+        self.view_size = LOD_VIEW_SIZE
+        # Áreas atualizadas acima do orçamento por terem esperado demais (ver _due)
+        self.lod_overbudget = 0
+
+    @staticmethod
+    def in_bounds(coord):
+        return 0 <= coord[0] < GRID_SIZE and 0 <= coord[1] < GRID_SIZE
+
+    @staticmethod
+    def coord_at(x, y):
+        gx = min(GRID_SIZE - 1, max(0, int(x // AREA_WIDTH)))
+        gy = min(GRID_SIZE - 1, max(0, int(y // AREA_HEIGHT)))
+        return gx, gy
+
+    def area_at(self, coord):
+        area = self.areas.get(coord)
+        if area is None:
+            area = self.areas[coord] = Area(coord[0], coord[1], self.npc_engine, self.seed, self.generation_cache)
+        return area
+
+    def _areas_near(self, x, y):
+        return set(self._areas_within(x, y, AREA_ACTIVATION_DISTANCE * 2)[:MAX_ACTIVE_AREAS])
 
-    def update_active_areas(self, player_x, player_y):
-        new_active_areas = set()
+    def _areas_within(self, x, y, limit):
+        # Só a vizinhança da célula do jogador pode ficar a menos de limit; ordenadas pela distância
+        gx, gy = self.coord_at(x, y)
+        reach_x, reach_y = math.ceil(limit / AREA_WIDTH), math.ceil(limit / AREA_HEIGHT)
         distances = []
-        for coord, area in self.areas.items():
-            distance = area.get_distance_to_player(player_x, player_y)
-            distances.append((distance, coord, area))
+        for cx in range(gx - reach_x, gx + reach_x + 1):
+            for cy in range(gy - reach_y, gy + reach_y + 1):
+                if not self.in_bounds((cx, cy)):
+                    continue
+                distance = math.hypot(
+                    x - (cx * AREA_WIDTH + AREA_WIDTH // 2), y - (cy * AREA_HEIGHT + AREA_HEIGHT // 2)
+                )
+                if distance < limit:
+                    distances.append((distance, (cx, cy)))
         distances.sort()
-        for i, (distance, coord, area) in enumerate(distances):
-            if i < MAX_ACTIVE_AREAS and distance < AREA_ACTIVATION_DISTANCE * 2:
-                new_active_areas.add(coord)
+        return [coord for _, coord in distances]
+
+    def update_active_areas(self, player_x, player_y, velocity=(0.0, 0.0)):
+        # O conjunto alvo só é recalculado quando o jogador troca de célula ou se
+        # afasta mais que ACTIVATION_HYSTERESIS do ponto do último cálculo
+        player_coord = self.coord_at(player_x, player_y)
+        last = self.last_activation
+        if (
+            last is None
+            or last[0] != player_coord
+            or math.hypot(player_x - last[1], player_y - last[2]) >= ACTIVATION_HYSTERESIS
+        ):
+            self.last_activation = (player_coord, player_x, player_y)
+            self.target_areas = self._areas_near(player_x, player_y)
+            # Áreas além das ativas ficam carregadas em baixo nível de detalhe
+            self.wanted_areas = self.target_areas | set(self._areas_within(player_x, player_y, LOD_LOAD_DISTANCE))
+            vx, vy = velocity
+            if self.streamer is not None and (vx or vy):
+                # Prefetch: as áreas que estariam ativas onde o jogador deve chegar
+                self.wanted_areas |= self._areas_near(
+                    player_x + vx * PREFETCH_SECONDS, player_y + vy * PREFETCH_SECONDS
+                )
+        elif self.active_areas == self.target_areas and not (self.streamer and self.streamer.pending):
+            return
+        wanted = self.wanted_areas
+        new_active_areas = self.target_areas
+        if self.streamer is not None:
+            new_active_areas = self._stream(wanted, new_active_areas, player_coord)
         for coord in self.active_areas - new_active_areas:
+            self._unindex_items(self.areas[coord])
             self.areas[coord].deactivate()
-            self.areas[coord].unload()
+        for coord in self.loaded_areas - wanted:
+            self.area_cache.put(coord, self.areas[coord].snapshot())
+            self.areas.pop(coord).unload()
+        self.loaded_areas &= wanted
+        if self.streamer is not None:
+            for coord in set(self.streamer.pending) - wanted:
+                data = self.streamer.cancel(coord)
+                if data is not None:
+                    self.area_cache.put(coord, data)
+                self.areas.pop(coord, None)
         for coord in new_active_areas - self.active_areas:
-            self.areas[coord].activate()
-        self.active_areas = new_active_areas
+            area = self.area_at(coord)
+            if not area.is_loaded:
+                area.load(self._dormant(coord))
+            area.activate()
+            self.loaded_areas.add(coord)
+            self._index_items(area)
+        self.active_areas = set(new_active_areas)
+        if self.streamer is None:
+            for coord in wanted - self.loaded_areas:
+                self.area_at(coord).load(self._dormant(coord))
+                self.loaded_areas.add(coord)
 
-    def update(self, dt, player):
-        for coord in self.active_areas:
-            self.areas[coord].update(dt, player)
+    def _dormant(self, coord):
+        # Estado dormente da área: do area_cache ou, na primeira ativação depois de
+        # carregar um checkpoint, das colunas salvas sobre o conteúdo gerado da seed
+        data = self.area_cache.take(coord)
+        if data is None and coord in self.saved_areas:
+            data = {**self.area_at(coord).generate(), **self.saved_areas.pop(coord)()}
+        return data
+
+    def dormant_states(self, coords):
+        # Estado atual de cada coord que ainda existe: snapshot das carregadas, entrada do cache das outras
+        states = {}
+        for coord in coords:
+            if coord in self.loaded_areas:
+                states[coord] = self.areas[coord].snapshot()
+            elif coord in self.area_cache.entries:
+                states[coord] = self.area_cache.entries[coord]
+        return states
+
+    def _stream(self, wanted, new_active_areas, player_coord):
+        for coord in wanted:
+            area = self.area_at(coord)
+            if not area.is_loaded and not self.streamer.is_pending(coord):
+                self.streamer.request(area, self._dormant(coord))
+        # A área onde o jogador está nunca pode faltar: se ainda não chegou, espera
+        player_area = self.areas[player_coord]
+        if not player_area.is_loaded:
+            player_area.build(*self.streamer.wait(player_coord))
+            self.loaded_areas.add(player_coord)
+        builds = 0
+        for coord in sorted(wanted, key=lambda c: c not in new_active_areas):
+            if builds >= STREAMING_BUILDS_PER_FRAME:
+                break
+            ready = self.streamer.take(coord)
+            if ready is not None:
+                self.areas[coord].build(*ready)
+                self.loaded_areas.add(coord)
+                builds += 1
+        # Áreas ainda em geração entram no conjunto ativo quando ficarem prontas
+        return {coord for coord in new_active_areas if self.areas[coord].is_loaded}
+
+    def close(self):
+        if self.streamer is not None:
+            self.streamer.shutdown()
+        if self.parallel is not None:
+            self.parallel.shutdown()
+            self.parallel = None
+        if self.generation_cache is not None:
+            self.generation_cache.close()
 
-    def draw(self, surface, viewport):
-        for area in self.areas.values():
-            area.draw(surface, viewport)
+    def _index_items(self, area):
+        for item in area.items:
+            if item.collected:
+                continue
+            key = self.free_item_keys.pop() if self.free_item_keys else len(self.indexed_items)
+            item.index_key = key
+            self.indexed_items[key] = (item, area)
+            self.item_index.insert(key, *item.rect)
 
-    def get_active_entities(self):
-        npcs = []
-        items = []
+    def _unindex_item(self, item):
+        if item.index_key is None:
+            return
+        self.item_index.remove(item.index_key)
+        del self.indexed_items[item.index_key]
+        self.free_item_keys.append(item.index_key)
+        item.index_key = None
+
+    def _unindex_items(self, area):
+        for item in area.items:
+            self._unindex_item(item)
+
+    def collect_items(self, rect):
+        collected = []
+        for key in self.item_index.query_rect(rect.x, rect.y, rect.width, rect.height).tolist():
+            item, area = self.indexed_items[key]
+            if rect.colliderect(item.rect):
+                item.collected = True
+                self._unindex_item(item)
+                area.remove_item(item)
+                self.dirty_areas.add(area.coord)
+                collected.append(item)
+        return collected
+
+    def compact(self):
+        # Mortes desde a última compactação: tira os NPCs mortos das áreas ativas
+        if self.npc_engine.deaths == self.compacted_deaths:
+            return
+        self.compacted_deaths = self.npc_engine.deaths
         for coord in self.active_areas:
+            self.areas[coord].compact()
+
+    def damage_npcs_in_radius(self, x, y, radius, damage):
+        hits = self.npc_engine.damage_many(self.npc_engine.query_radius(x, y, radius), damage)
+        if hits:
+            x0, y0 = self.coord_at(x - radius, y - radius)
+            x1, y1 = self.coord_at(x + radius, y + radius)
+            self.dirty_areas.update(
+                coord for coord in self.active_areas if x0 <= coord[0] <= x1 and y0 <= coord[1] <= y1
+            )
+        self.compact()
+        return hits
+
+    def _update_tiers(self, px, py):
+        # Nível 0: áreas ativas que cruzam o retângulo da câmera (view_size centrado no
+        # jogador, mais LOD_VIEW_MARGIN); nível 1: demais áreas ativas; nível 2: carregadas
+        # e inativas (os NPCs delas não estão no índice, só derivam)
+        half_width = self.view_size[0] / 2 + LOD_VIEW_MARGIN
+        half_height = self.view_size[1] / 2 + LOD_VIEW_MARGIN
+        full, near, far = [], [], []
+        for coord in self.loaded_areas:
             area = self.areas[coord]
-            npcs.extend(area.npcs)
-            items.extend(area.items)
-        return npcs, items
+            if (
+                area.world_x < px + half_width and px - half_width < area.world_x + AREA_WIDTH
+                and area.world_y < py + half_height and py - half_height < area.world_y + AREA_HEIGHT
+                and coord in self.active_areas
+            ):
+                full.append(area)
+            elif coord in self.active_areas:
+                near.append(area)
+            else:
+                far.append(area)
+        self.lod_tiers = (full, near, far)
+        return full, near, far
+
+    def _due(self, areas, dt, interval, budget):
+        # Áreas cujo intervalo venceu, as mais atrasadas primeiro, enquanto couberem no
+        # orçamento de NPCs. Uma área que não cabe espera; se já passou LOD_MAX_STEP do
+        # intervalo, roda mesmo assim (senão uma área maior que o orçamento nunca andaria)
+        # e conta em lod_overbudget.
+        due = []
+        for area in areas:
+            area.lod_elapsed += dt
+        for area in sorted(areas, key=lambda area: -area.lod_elapsed):
+            if area.lod_elapsed < interval:
+                break
+            count = len(area.slots)
+            if count > budget:
+                if area.lod_elapsed < interval + LOD_MAX_STEP:
+                    continue
+                self.lod_overbudget += 1
+            budget -= count
+            due.append(area)
+        return due, budget
+
+    def _mark_moved(self, areas):
+        # NPCs vivos vão andar (e o cooldown correr) neste tick
+        self.dirty_areas.update(area.coord for area in areas if len(area.slots))
+
+    def update(self, dt, player):
+        # Simulação em níveis: o nível 0 (na tela) anda todo tick e não tem orçamento, mas
+        # os NPCs dele são descontados de LOD_NPC_BUDGET; os outros níveis andam em ritmo
+        # reduzido dentro do que sobrar. Dano por contato uma vez no fim.
+        engine = self.npc_engine
+        px, py = player.get_rect().center
+        full, near, far = self._update_tiers(px, py)
+        if self.active_areas:
+            self.flow_field.update([self.areas[coord] for coord in self.active_areas], px, py)
+        self._mark_moved(full)
+        if full:
+            engine.move(np.concatenate([area.slots for area in full]), dt, player, self.flow_field)
+        budget = LOD_NPC_BUDGET - sum(len(area.slots) for area in full)
+        due, budget = self._due(near, dt, LOD_NEAR_INTERVAL, budget)
+        self._mark_moved(due)
+        if due:
+            engine.move(
+                np.concatenate([area.slots for area in due]),
+                np.concatenate([np.full(len(area.slots), min(area.lod_elapsed, LOD_MAX_STEP)) for area in due]),
+                player,
+                self.flow_field,
+            )
+        for area in due:
+            area.lod_elapsed = 0.0
+        due, budget = self._due(far, dt, LOD_FAR_INTERVAL, budget)
+        self._mark_moved(due)
+        for area in due:
+            engine.drift(area.slots, min(area.lod_elapsed, LOD_FAR_INTERVAL * 2), self.lod_rng)
+            area.lod_elapsed = 0.0
+        hits = engine.attack(player)
+        self.compact()
+        return hits
+
+    def visible_areas(self, viewport):
+        # Culling por área: só as células da grade que cruzam o AABB do viewport
+        x0, y0 = self.coord_at(viewport.x, viewport.y)
+        x1, y1 = self.coord_at(viewport.x + viewport.width, viewport.y + viewport.height)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                area = self.areas.get((cx, cy))
+                if area is not None and area.is_loaded:
+                    yield area
+
+    def draw(self, surface, viewport, alpha=1.0):
+        queue = self.render_queue
+        for area in self.visible_areas(viewport):
+            area.submit(queue, viewport, alpha)
+        queue.flush(surface)